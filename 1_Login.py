@@ -1,8 +1,6 @@
 # pages/1_Login.py
 import streamlit as st
-import requests
-
-FASTAPI_URL = "http://127.0.0.1:8000"
+import api_client as api
 
 st.set_page_config(page_title="Login", layout="centered")
 st.title("🔐 Login / Register")
@@ -21,7 +19,7 @@ password = st.text_input("Password", type="password", key="login_password")
 if st.button("Submit"):
     if tab == "Register":
         try:
-            r = requests.post(f"{FASTAPI_URL}/register", json={"email": email, "password": password})
+            r = api.post("/register", json={"email": email, "password": password})
             if r.status_code == 201:
                 st.success("Registered — now login")
             else:
@@ -30,7 +28,7 @@ if st.button("Submit"):
             st.error(f"Error: {e}")
     else:  # Login
         try:
-            r = requests.post(f"{FASTAPI_URL}/token", data={"username": email, "password": password})
+            r = api.post("/token", data={"username": email, "password": password})
             if r.status_code == 200:
                 token = r.json()["access_token"]
                 st.session_state["token"] = token
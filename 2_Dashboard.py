@@ -4,7 +4,8 @@ import requests
 import plotly.express as px
 import pandas as pd
 
-FASTAPI_URL = "http://127.0.0.1:8000"
+import api_client as api
+
 st.set_page_config(page_title="Dashboard", layout="wide")
 st.title("📊 Dashboard")
 
@@ -12,23 +13,59 @@ if "token" not in st.session_state or not st.session_state["token"]:
     st.warning("Please login first.")
     st.stop()
 
-headers = {"Authorization": f"Bearer {st.session_state['token']}"}
+# --- Saved Recommendations History (fetched a page at a time) ---
+PAGE_SIZE = 10
+
+def fetch_page(path, key, cursor=None, **extra):
+    params = {"limit": PAGE_SIZE, **extra}
+    if cursor:
+        params["after"] = cursor
+    r = api.get(path, params=params)
+    if r.status_code != 200:
+        return None
+    body = r.json()
+    return body.get(key, []), body.get("next_cursor")
+
+def load_dashboard():
+    # one round trip for history, badges and quiz scores; while the ETag is unchanged the
+    # pages already in session_state (including any "Load more" results) are kept as they are
+    entry = api.dashboard(PAGE_SIZE)
+    if entry is None:
+        st.session_state.pop("dashboard_etag", None)
+        st.session_state["history_page"] = st.session_state["quiz_page"] = None
+        st.session_state["badges"] = None
+        return
+    if entry["etag"] and entry["etag"] == st.session_state.get("dashboard_etag"):
+        return
+    body = entry["body"]
+    st.session_state["dashboard_etag"] = entry["etag"]
+    st.session_state["history_page"] = (body["history"], body["history_next_cursor"])
+    st.session_state["quiz_page"] = (body["scores"], body["scores_next_cursor"])
+    st.session_state["badges"] = body["badges"]
 
-# --- Saved Recommendations History ---
-r = requests.get(f"{FASTAPI_URL}/history", headers=headers)
-if r.status_code == 200:
-    hist = r.json().get("history", [])
+if st.button("🔄 Refresh"):
+    api.clear_dashboard()
+    st.session_state.pop("dashboard_etag", None)
+
+load_dashboard()
+page = st.session_state["history_page"]
+if page is not None:
+    hist, next_cursor = page
     if hist:
         st.subheader("Saved Recommendations")
         for it in hist:
             st.markdown(f"**{it['title']}** — {it['created_at']}")
-            top = it["data"].get("top_careers", [])
-            if top:
-                st.write(f"Top: {top[0]['career']} — {top[0]['match_score']}%")
+            if it.get("top_career"):
+                st.write(f"Top: {it['top_career']} — {it['top_score']}%")
             st.markdown("---")
+        if next_cursor and st.button("Load more recommendations"):
+            more = fetch_page("/history", "history", next_cursor, fields="summary")
+            if more is not None:
+                st.session_state["history_page"] = (hist + more[0], more[1])
+                st.rerun()
 
-        # Histogram of match scores
-        scores = [h["data"]["top_careers"][0]["match_score"] for h in hist if h["data"].get("top_careers")]
+        # Histogram of match scores (for the pages loaded so far)
+        scores = [h["top_score"] for h in hist if h.get("top_score") is not None]
         fig = px.histogram(scores, nbins=8, title="Saved Top Match Scores")
         st.plotly_chart(fig, use_container_width=True)
     else:
@@ -37,9 +74,8 @@ else:
     st.error("Could not fetch history.")
 
 # --- Badges ---
-b = requests.get(f"{FASTAPI_URL}/badges", headers=headers)
-if b.status_code == 200:
-    badges = b.json().get("badges", [])
+badges = st.session_state["badges"]
+if badges is not None:
     st.subheader("🏅 Badges")
     if badges:
         for bd in badges:
@@ -50,40 +86,49 @@ if b.status_code == 200:
 # --- Job Trends ---
 st.subheader("📈 Job Trends")
 q = st.text_input("Check job trend for (skill/career)", value="Data Scientist")
+granularity = st.radio("Granularity", ["month", "quarter"], horizontal=True)
 if st.button("Get Job Trends"):
-    jt = requests.get(f"{FASTAPI_URL}/job_trends", params={"q": q})
-    if jt.status_code == 200:
-        trend = jt.json()["trend"]
+    try:
+        trend = api.job_trends(q, granularity)["trend"]
         df = pd.DataFrame(trend)
-        st.line_chart(df.set_index("date"))
+        st.line_chart(df.set_index("date")[["postings", "rolling_avg"] if "postings" in df else ["demand_index"]])
+    except requests.RequestException:
+        st.error("Could not fetch job trends")
 
 # --- Quiz Scores ---
 st.subheader("📝 Quiz Performance")
-quiz_scores = requests.get(f"{FASTAPI_URL}/history", headers=headers)  # reuse? or create /quiz_history later
-# If you add /quiz_history endpoint in api.py, replace above with that.
 try:
-    qh = requests.get(f"{FASTAPI_URL}/quiz_scores", headers=headers)
-    if qh.status_code == 200:
-        data = qh.json().get("scores", [])
+    page = st.session_state["quiz_page"]
+    if page is not None:
+        data, next_cursor = page
         if data:
             df = pd.DataFrame(data)
             st.dataframe(df)
             fig2 = px.bar(df, x="created_at", y="score", color="career", title="Quiz Scores Over Time")
             st.plotly_chart(fig2, use_container_width=True)
+            if next_cursor and st.button("Load more quiz attempts"):
+                more = fetch_page("/quiz_scores", "scores", next_cursor)
+                if more is not None:
+                    st.session_state["quiz_page"] = (data + more[0], more[1])
+                    st.rerun()
         else:
             st.info("No quiz attempts yet.")
+    else:
+        st.info("Quiz scores not available (check API).")
 except:
     st.info("Quiz scores not available (check API).")
 
 # --- Career Comparison ---
 st.subheader("⚖️ Compare Careers")
-c1 = st.selectbox("Career 1", list(headers) if 'career_db' in globals() else ["Data Scientist","Web Developer","AI Engineer","Product Manager"], key="c1")
+c1 = st.selectbox("Career 1", ["Data Scientist","Web Developer","AI Engineer","Product Manager"], key="c1")
 c2 = st.selectbox("Career 2", ["Web Developer","AI Engineer","Product Manager","Data Scientist"], key="c2")
 
 if st.button("Compare"):
-    comp = requests.get(f"{FASTAPI_URL}/compare_careers", params={"c1": c1, "c2": c2}, headers=headers)
-    if comp.status_code == 200:
-        data = comp.json()
+    try:
+        data = api.compare_careers(c1, c2)
+    except requests.RequestException:
+        data = None
+    if data is not None:
         col1, col2 = st.columns(2)
         with col1:
             st.markdown(f"### {data['career1']['name']}")
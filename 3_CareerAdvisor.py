@@ -1,10 +1,10 @@
 # pages/3_CareerAdvisor.py
 import streamlit as st
-import requests
 from datetime import datetime
 import plotly.graph_objects as go
 
-FASTAPI_URL = "http://127.0.0.1:8000"
+import api_client as api
+
 st.set_page_config(page_title="Career Advisor", layout="wide")
 st.title("🧭 Career Advisor")
 
@@ -14,8 +14,7 @@ if "token" not in st.session_state or not st.session_state["token"]:
 
 skills = st.text_area("Enter skills (comma separated)", value="Python, SQL")
 if st.button("Get Advice"):
-    headers = {"Authorization": f"Bearer {st.session_state['token']}"}
-    r = requests.post(f"{FASTAPI_URL}/advise", json={"user_skills": skills}, headers=headers)
+    r = api.post("/advise", json={"user_skills": skills})
     if r.status_code == 200:
         data = r.json()
         st.session_state["latest_advice"] = data
@@ -37,16 +36,14 @@ if "latest_advice" in st.session_state:
 
     # Save button
     if st.button("Save Recommendation"):
-        headers = {"Authorization": f"Bearer {st.session_state['token']}"}
         title = f"Advice {datetime.utcnow().isoformat()}"
-        resp = requests.post(f"{FASTAPI_URL}/save", json={"title": title, "payload": adv}, headers=headers)
+        resp = api.post("/save", json={"title": title, "payload": adv})
         if resp.status_code == 201:
             st.success("Saved")
         else:
             st.error("Save failed")
     if st.button("Export PDF (server)"):
-        headers = {"Authorization": f"Bearer {st.session_state['token']}"}
-        resp = requests.post(f"{FASTAPI_URL}/export_pdf", json=st.session_state["latest_advice"], headers=headers, stream=True)
+        resp = api.post("/export_pdf", json=st.session_state["latest_advice"], stream=True)
         if resp.status_code == 200:
             st.download_button("Download Report", data=resp.content, file_name="career_report.pdf", mime="application/pdf")
         else:
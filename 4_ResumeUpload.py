@@ -1,8 +1,8 @@
 # pages/4_ResumeUpload.py
 import streamlit as st
-import requests
 
-FASTAPI_URL = "http://127.0.0.1:8000"
+import api_client as api
+
 st.set_page_config(page_title="Resume Upload")
 st.title("📄 Resume Upload & Skill Extraction")
 
@@ -10,14 +10,12 @@ if "token" not in st.session_state or not st.session_state["token"]:
     st.warning("Please login first.")
     st.stop()
 
-headers = {"Authorization": f"Bearer {st.session_state['token']}"}
-
 uploaded = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
 if uploaded:
     files = {"file": ("resume.pdf", uploaded.read(), "application/pdf")}
 
     # --- Extract skills ---
-    resp = requests.post(f"{FASTAPI_URL}/upload_resume", files=files, headers=headers)
+    resp = api.post("/upload_resume", files=files)
     if resp.status_code == 200:
         out = resp.json()
         st.subheader("Extracted Skills")
@@ -28,14 +26,14 @@ if uploaded:
         # --- Analyze extracted skills directly ---
         if st.button("Analyze Extracted Skills"):
             skills = ", ".join(out.get("extracted_skills", []))
-            r = requests.post(f"{FASTAPI_URL}/advise", json={"user_skills": skills}, headers=headers)
+            r = api.post("/advise", json={"user_skills": skills})
             if r.status_code == 200:
                 st.session_state["latest_advice"] = r.json()
                 st.success("Analysis complete — go to Career Advisor page to view")
 
         # --- Resume Enhancement ---
         st.subheader("✨ Resume Enhancement Suggestions")
-        enh = requests.post(f"{FASTAPI_URL}/resume_enhance", files=files, headers=headers)
+        enh = api.post("/resume_enhance", files=files)
         if enh.status_code == 200:
             suggestions = enh.json().get("suggestions", [])
             if suggestions:
@@ -50,7 +48,7 @@ if uploaded:
                     "title": "Resume Analysis",
                     "payload": {"suggestions": suggestions, "skills": out.get("extracted_skills", [])}
                 }
-                r = requests.post(f"{FASTAPI_URL}/save", json=save_payload, headers=headers)
+                r = api.post("/save", json=save_payload)
                 if r.status_code == 201:
                     st.success("Resume analysis saved! (Check Dashboard for badges)")
                 else:
@@ -63,7 +61,7 @@ if uploaded:
                     "skills": out.get("extracted_skills", []),
                     "suggestions": suggestions
                 }
-                r = requests.post(f"{FASTAPI_URL}/export_pdf", json=pdf_payload, headers=headers, stream=True)
+                r = api.post("/export_pdf", json=pdf_payload, stream=True)
                 if r.status_code == 200:
                     st.download_button(
                         "📥 Download Enhanced Resume",
@@ -1,8 +1,8 @@
 # pages/6_Quiz.py
 import streamlit as st
-import requests
 
-FASTAPI_URL = "http://127.0.0.1:8000"
+import api_client as api
+
 st.set_page_config(page_title="Skill Quiz", layout="wide")
 st.title("📝 Skill Quiz")
 
@@ -10,19 +10,14 @@ if "token" not in st.session_state or not st.session_state["token"]:
     st.warning("Please login first.")
     st.stop()
 
-headers = {"Authorization": f"Bearer {st.session_state['token']}"}
-
 # --- Select Career ---
 career = st.selectbox("Choose a career/skill for quiz:", ["Python", "SQL", "Data Scientist", "Web Developer"])
 num_qs = st.slider("How many questions do you want?", 1, 5, 3)
 
 if st.button("Get Quiz"):
     try:
-        r = requests.get(
-            f"{FASTAPI_URL}/quiz_questions",
-            params={"career": career, "limit": num_qs},
-            headers=headers
-        )
+        # not cached: every request draws a fresh random sample
+        r = api.get("/quiz_questions", params={"career": career, "limit": num_qs})
         if r.status_code == 200:
             st.session_state["quiz_data"] = r.json()
             st.session_state["quiz_answers"] = {}
@@ -37,24 +32,36 @@ if "quiz_data" in st.session_state:
     answers = {}
 
     st.subheader(f"Quiz on {quiz['career']}")
-    for idx, q in enumerate(quiz["questions"]):
-        answers[str(idx)] = st.radio(
+    for q in quiz["questions"]:
+        answers[str(q["id"])] = st.radio(
             q["q"], 
             q["options"], 
-            key=f"q{idx}"
+            key=f"q{q['id']}"
         )
 
     if st.button("Submit Quiz"):
         try:
-            resp = requests.post(
-                f"{FASTAPI_URL}/submit_quiz",
-                json={"career": quiz["career"], "answers": answers},
-                headers=headers
-            )
+            resp = api.post("/submit_quiz", json={"career": quiz["career"], "quiz_token": quiz["quiz_token"], "answers": answers})
             if resp.status_code == 200:
                 res = resp.json()
-                st.success(f"✅ You scored {res['score']} / {res['total']}")
+                if res["percentile"] is None:
+                    st.success(f"✅ You scored {res['score']} / {res['total']} (too few questions to rank)")
+                else:
+                    st.success(f"✅ You scored {res['score']} / {res['total']} — better than {res['percentile']}% of attempts")
             else:
                 st.error(resp.json().get("detail", "Error submitting quiz"))
         except Exception as e:
             st.error(f"Error submitting answers: {e}")
+
+# --- Leaderboard ---
+st.subheader(f"🏆 {career} Leaderboard")
+lb = api.get("/quiz_leaderboard", params={"career": career, "limit": 10})
+if lb.status_code == 200:
+    board = lb.json()
+    if board["leaders"]:
+        st.table([{"Rank": l["rank"], "Player": l["user"] + (" (you)" if l["you"] else ""), "Best %": l["best_pct"]}
+                  for l in board["leaders"]])
+        if board["you"]:
+            st.caption(f"Your rank: {board['you']['rank']} of {board['players']} players")
+    else:
+        st.info("No attempts yet for this quiz.")
@@ -2,7 +2,8 @@
 import streamlit as st
 import requests
 
-FASTAPI_URL = "http://127.0.0.1:8000"
+import api_client as api
+
 st.set_page_config(page_title="Mock Interview", layout="wide")
 st.title("🎤 Mock Interview Simulator")
 
@@ -10,14 +11,11 @@ if "token" not in st.session_state or not st.session_state["token"]:
     st.warning("Please login first.")
     st.stop()
 
-headers = {"Authorization": f"Bearer {st.session_state['token']}"}
-
 career = st.selectbox("Choose career for interview:", ["Data Scientist", "Web Developer", "AI Engineer", "Product Manager"])
 if st.button("Get Questions"):
-    r = requests.get(f"{FASTAPI_URL}/interview_questions", params={"career": career}, headers=headers)
-    if r.status_code == 200:
-        st.session_state["interview_qs"] = r.json()["questions"]
-    else:
+    try:
+        st.session_state["interview_qs"] = api.interview_questions(career)["questions"]
+    except requests.RequestException:
         st.error("Could not fetch interview questions")
 
 if "interview_qs" in st.session_state:
@@ -28,15 +26,15 @@ if "interview_qs" in st.session_state:
         answers.append(ans)
 
     if st.button("Submit Answers"):
-        resp = requests.post(f"{FASTAPI_URL}/interview_feedback",
-                             params={"career": career},
-                             json={"answers": answers},
-                             headers=headers)
+        resp = api.post("/interview_feedback", params={"career": career}, json={"answers": answers})
         if resp.status_code == 200:
             feedback = resp.json()["feedback"]
             st.subheader("Feedback")
             for fb in feedback:
+                st.markdown(f"**{fb['question']}** — score {fb['score']}/100")
                 st.write(f"Answer: {fb['answer']}")
-                st.success(f"Keywords matched: {', '.join(fb['keywords_matched']) or 'None'}")
+                st.success(f"Concepts covered: {', '.join(fb['keywords_matched']) or 'None'}")
+                if fb["missing_concepts"]:
+                    st.warning(f"Consider covering: {', '.join(fb['missing_concepts'])}")
         else:
             st.error("Error getting feedback")
@@ -1,30 +1,101 @@
 # api.py
-from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile, Query, Request, Header, Body
+from fastapi.responses import StreamingResponse, JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-import json, io
+from contextlib import asynccontextmanager
+import json, io, asyncio, tempfile, os, base64, time
 
 # DB / SQLAlchemy (same as earlier)
-from sqlalchemy import Column, Integer, String, Text, DateTime, create_engine, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, create_engine, ForeignKey, Index, UniqueConstraint, event, inspect, or_, and_, insert, update, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-# For PDF extraction (lightweight)
-from PyPDF2 import PdfReader
+import fast_json
+from auth_cache import Principal, PrincipalCache
+from badge_rules import BADGE_RULES, BADGE_NAMES, TOP_MATCH_MIN_SCORE, QUIZ_FANATIC_MIN_QUIZZES, earned_badges, is_perfect_quiz, is_resume_title, quiz_master_badge
+from career_catalog import CatalogError, CatalogHolder
+from metrics import Metrics, MetricsMiddleware, instrument_engine
+from migrations import run_migrations
+from payload_summary import summarize_payload
+from quiz_stats import QuizStats
+from password_hashing import HashingBusy, HashingPool
+
+from interview_scoring import InterviewScorer
+from job_trends import TrendStore, parse_period
+from profiling import ProfileStore, ProfilingMiddleware
+from pdf_tools import BoundedProcessPool, PoolBusy, PoolTimeout, ReportCache, extract_text, render_report, report_key, timed_call
+from resume_cache import ResumeCache, content_key
+from response_cache import CachedBody, ResponseCache
+from skill_matcher import KeywordAutomaton
 
 SECRET_KEY = "replace_this_with_a_strong_secret"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-DATABASE_URL = "sqlite:///./app.db"
+# Changing BCRYPT_ROUNDS is picked up transparently: older hashes are re-hashed on next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
+
+def _async_url(url: str) -> str:
+    # same database through an asyncio driver
+    for sync_prefix, async_prefix in (("sqlite://", "sqlite+aiosqlite://"), ("postgresql://", "postgresql+asyncpg://"),
+                                      ("mysql://", "mysql+aiomysql://")):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# SQLite keeps SQLAlchemy's default per-file pooling; other backends get a sized pool
+DB_POOL_OPTIONS = {} if IS_SQLITE else {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_pre_ping": True,
+}
 
 Base = declarative_base()
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if IS_SQLITE else {}, **DB_POOL_OPTIONS)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# async path for the hot data endpoints; concurrency is bounded by the pool, not Starlette's threadpool
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **DB_POOL_OPTIONS)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+if IS_SQLITE:
+    # WAL lets readers run alongside the single writer; NORMAL syncs at checkpoints, not every commit
+    @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.close()
+
+# SQLite has one writer at a time. Queueing async writers here is far cheaper than letting them
+# collide on the file lock and back off in SQLite's busy handler; other backends don't need it.
+# Nothing may wait here while holding a pooled connection: the writer holding the slot may need
+# one, and with the pool drained by waiters it would time out. Pass the request's session and its
+# open (read-only) transaction is ended first, handing the connection back while it queues.
+sqlite_writer = asyncio.Lock() if IS_SQLITE else None
+
+@asynccontextmanager
+async def db_write_slot(db=None):
+    if sqlite_writer is None:
+        yield
+        return
+    if db is not None and db.in_transaction():
+        await db.commit()
+    async with sqlite_writer:
+        yield
 
 class User(Base):
     __tablename__ = "users"
@@ -41,27 +112,125 @@ class SavedRecommendation(Base):
     title = Column(String, index=True)
     data = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # summary of `data`, filled at /save time so listings never decode the blob
+    kind = Column(String)  # "advice" | "resume" | "other"
+    top_career = Column(String)
+    top_score = Column(Float)
     owner = relationship("User", back_populates="saves")
+    __table_args__ = (Index("ix_saved_recommendations_user_created", "user_id", "created_at", "id"),
+                      Index("ix_saved_recommendations_user_kind", "user_id", "kind"))
+
+class QuizScore(Base):
+    __tablename__ = "quiz_scores"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    career = Column(String, index=True)
+    score = Column(Integer)
+    total = Column(Integer)  # questions answered in this attempt
+    created_at = Column(DateTime, default=datetime.utcnow)
+    owner = relationship("User")
+    __table_args__ = (Index("ix_quiz_scores_user_created", "user_id", "created_at", "id"),)
+
+class QuizQuestion(Base):
+    # seq numbers each (career, difficulty) slot densely from 0, so a random question is a
+    # random seq below the slot's count: one unique-index lookup, whatever the bank's size
+    __tablename__ = "quiz_questions"
+    id = Column(Integer, primary_key=True, index=True)
+    career = Column(String, nullable=False)
+    difficulty = Column(String, nullable=False)
+    seq = Column(Integer, nullable=False)
+    question = Column(Text, nullable=False)
+    options = Column(Text, nullable=False)  # JSON list
+    answer = Column(String, nullable=False)
+    __table_args__ = (UniqueConstraint("career", "difficulty", "seq", name="uq_quiz_questions_slot"),)
+
+class UserBadge(Base):
+    # badges materialized by /save and /submit_quiz; one row per user per rule
+    __tablename__ = "user_badges"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    rule = Column(String, nullable=False)
+    badge_id = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    earned_at = Column(DateTime)
+    __table_args__ = (UniqueConstraint("user_id", "rule", name="uq_user_badges_user_rule"),)
 
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
-app = FastAPI(title="AI Career Advisor - Enhanced API")
-
-# Simple career DB
-career_db = {
-    "Data Scientist": {"required_skills": ["Python","Machine Learning","Statistics","SQL","Data Visualization"],
-                       "roadmap": ["Python basics","Statistics","SQL","ML algorithms","Projects"]},
-    "Web Developer": {"required_skills": ["HTML","CSS","JavaScript","React","APIs"],
-                      "roadmap": ["HTML/CSS","JS fundamentals","React","Backend basics","Full-stack projects"]},
-    "AI Engineer": {"required_skills": ["Python","Deep Learning","NLP","PyTorch"],
-                    "roadmap": ["Python","DL fundamentals","PyTorch","NLP projects","Research reading"]},
-    "Product Manager": {"required_skills": ["Communication","Project Management","Leadership","Business Analysis"],
-                        "roadmap": ["Communication","Agile & Scrum","Market research","Product cases"]}
-}
+@asynccontextmanager
+async def lifespan(app):
+    global trend_store
+    trend_store = await run_in_threadpool(open_trend_store)
+    await run_in_threadpool(load_quiz_stats)
+    watcher = asyncio.create_task(_watch_catalog()) if CATALOG_POLL_SECONDS > 0 else None
+    yield
+    if watcher is not None:
+        watcher.cancel()
+    pdf_pool.shutdown()
+    render_pool.shutdown()
+    hashing_pool.shutdown()
+    await async_engine.dispose()
+
+class FastJSONResponse(JSONResponse):
+    # the default response class: every dict/list result is encoded by fast_json (orjson when installed).
+    # Heavy endpoints also declare a response_model, so FastAPI validates and serializes them with
+    # pydantic's compiled schemas instead of walking the result in jsonable_encoder.
+    def render(self, content) -> bytes:
+        return fast_json.dumps(content)
+
+app = FastAPI(title="AI Career Advisor - Enhanced API", lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Prometheus-format metrics on GET /metrics: per-route latency and status, requests in flight,
+# SQL statements and time per request (both engines), PDF extract/render stage timings
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+# Career catalog: CAREER_CATALOG_PATH (JSON or CSV, see career_catalog.py) loaded into an
+# immutable snapshot. Each worker polls the file every CATALOG_POLL_SECONDS and swaps in a new
+# snapshot when it changes; POST /admin/reload_catalog reloads the worker that receives it now.
+CAREER_CATALOG_PATH = os.getenv("CAREER_CATALOG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "careers.json"))
+CATALOG_POLL_SECONDS = float(os.getenv("CATALOG_POLL_SECONDS", "5"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")  # unset: admin endpoints answer 404
+career_catalog = CatalogHolder(CAREER_CATALOG_PATH)
+
+async def _watch_catalog():
+    while True:
+        await asyncio.sleep(CATALOG_POLL_SECONDS)
+        if await run_in_threadpool(career_catalog.reload_if_changed):
+            response_cache.clear()
+
+# Responses of the pure endpoints (/advise, /compare_careers, /interview_questions, /job_trends),
+# keyed on canonical inputs and dropped when the catalog reloads (see response_cache.py). GETs
+# also carry a weak ETag and Cache-Control, so browsers and proxies can reuse them too.
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "4096"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_MAX_AGE_SECONDS = int(os.getenv("RESPONSE_MAX_AGE_SECONDS", "60"))  # what clients and proxies are told
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_BYTES)
+
+def cached_response(request: Request, entry: CachedBody, body: bytes = None) -> Response:
+    # body: the full response, when the cached entry is only the part that was worth caching
+    headers = {"ETag": entry.etag, "Cache-Control": f"public, max-age={RESPONSE_MAX_AGE_SECONDS}"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body if body is None else body, media_type="application/json", headers=headers)
 
 # Auth utils
 def get_password_hash(p): return pwd_context.hash(p)
 def verify_password(plain, hashed): return pwd_context.verify(plain, hashed)
+
+# bcrypt (~200 ms per call) gets its own pool so logins can't starve other sync endpoints;
+# beyond HASH_MAX_PENDING waiting jobs, /register and /token answer 429 immediately
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "4"))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", str(HASH_WORKERS * 8)))
+hashing_pool = HashingPool(HASH_WORKERS, HASH_MAX_PENDING)
+
+@app.exception_handler(HashingBusy)
+async def hashing_busy_handler(request: Request, exc: HashingBusy):
+    return JSONResponse(status_code=429, content={"detail": "Too many login attempts in progress, please retry"}, headers={"Retry-After": "1"})
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
@@ -78,10 +247,34 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def get_user_by_email(db, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(get_db)):
+# Verified token -> Principal(id, email). Entries expire after AUTH_CACHE_TTL_SECONDS (or the
+# token's own exp, whichever is first) and are dropped when the user is deleted or their
+# password/email changes. Invalidation is per process, so the TTL bounds staleness across workers.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+principal_cache = PrincipalCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    principal_cache.invalidate_user(target.id)
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.hashed_password.history.has_changes() or state.attrs.email.history.has_changes():
+        principal_cache.invalidate_user(target.id)
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
     credentials_exception = HTTPException(status_code=401, detail="Could not validate credentials")
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -90,10 +283,15 @@ def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(get_db)):
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user_by_email(db, email=email)
+    # own short session, not the request's: the connection goes back to the pool before the
+    # handler runs, so a cache miss never holds one while the handler queues for db_write_slot
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(select(User.id, User.email).where(User.email == email))).first()
     if user is None:
         raise credentials_exception
-    return user
+    principal = Principal(user.id, user.email)
+    principal_cache.put(token, principal, payload.get("exp", 0))
+    return principal
 
 # Schemas
 class UserCreate(BaseModel):
@@ -107,324 +305,891 @@ class SavePayload(BaseModel):
     title: str
     payload: dict
 
-# Core analyze function (same logic)
-def analyze_skills(user_skills):
-    user = {s.strip().capitalize() for s in user_skills.split(",") if s.strip()}
-    results = []
-    for career, details in career_db.items():
-        req = {s.capitalize() for s in details["required_skills"]}
-        matched = sorted(list(req & user))
-        missing = sorted(list(req - user))
-        score = round((len(matched) / len(req)) * 100, 2) if req else 0.0
-        results.append({"career": career, "match_score": score, "matched_skills": matched, "missing_skills": missing, "roadmap": details["roadmap"]})
-    return sorted(results, key=lambda x: x["match_score"], reverse=True)
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+# Opt-in request profiling, off unless PROFILE_DIR is set (then the middleware is installed).
+# A request is profiled when it carries "X-Profile: 1" with the admin token, or at
+# PROFILE_SAMPLE_RATE; the newest PROFILE_KEEP profiles are kept, see /admin/profiles.
+# A profile covers the whole worker while the request runs, including any other requests
+# it overlapped; those are counted in its metadata ("overlapping_requests", "exclusive").
+PROFILE_DIR = os.getenv("PROFILE_DIR") or None
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_FORMATS = {"collapsed": "text/plain; charset=utf-8", "pstats": "application/octet-stream", "json": "application/json"}
+profile_store = ProfileStore(PROFILE_DIR, PROFILE_KEEP) if PROFILE_DIR else None
+if profile_store is not None:
+    app.add_middleware(ProfilingMiddleware, store=profile_store, admin_token=ADMIN_TOKEN, sample_rate=PROFILE_SAMPLE_RATE)
+
+def require_profile_store() -> ProfileStore:
+    if profile_store is None:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PROFILE_DIR)")
+    return profile_store
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles(store: ProfileStore = Depends(require_profile_store)):
+    return {"profiles": await run_in_threadpool(store.list)}
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str, fmt: str = Query("collapsed", alias="format", pattern="^(collapsed|pstats|json)$"),
+                      store: ProfileStore = Depends(require_profile_store)):
+    try:
+        data = await run_in_threadpool(store.read, profile_id, fmt)
+    except (KeyError, OSError):
+        raise HTTPException(status_code=404, detail="No such profile")
+    return Response(data, media_type=PROFILE_FORMATS[fmt],
+                    headers={"Content-Disposition": f'attachment; filename="{profile_id}.{fmt}"'})
+
+@app.post("/admin/reload_catalog", dependencies=[Depends(require_admin)])
+def reload_catalog():
+    try:
+        career_catalog.reload()
+    except CatalogError as e:
+        raise HTTPException(status_code=422, detail=f"Catalog not reloaded: {e}")
+    response_cache.clear()
+    return career_catalog.stats()
 
 # --- Auth endpoints ---
+def _add_user(db, user):
+    db.add(user); db.commit(); db.refresh(user)
+    return user
+
 @app.post("/register", status_code=201)
-def register(u: UserCreate, db=Depends(get_db)):
-    if get_user_by_email(db, u.email):
+async def register(u: UserCreate, db=Depends(get_db)):
+    if await run_in_threadpool(get_user_by_email, db, u.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = User(email=u.email, hashed_password=get_password_hash(u.password))
-    db.add(user); db.commit(); db.refresh(user)
+    hashed = await hashing_pool.run(get_password_hash, u.password)
+    user = await run_in_threadpool(_add_user, db, User(email=u.email, hashed_password=hashed))
     return {"msg":"user_created","email":user.email}
 
 @app.post("/token")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(get_db)):
-    user = get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(get_db)):
+    user = await run_in_threadpool(get_user_by_email, db, form_data.username)
+    if not user:
+        raise HTTPException(status_code=401, detail="Incorrect username or password")
+    ok, new_hash = await hashing_pool.run(pwd_context.verify_and_update, form_data.password, user.hashed_password)
+    if not ok:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
+    if new_hash:  # hash was made with an old BCRYPT_ROUNDS
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
     token = create_access_token({"sub": user.email}, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     return {"access_token": token, "token_type": "bearer"}
 
 # --- Advice / Save / History ---
 @app.post("/advise")
-def advise(sk: Skills, current_user: Optional[User] = Depends(get_current_user) or None):
-    out = analyze_skills(sk.user_skills)
+def advise(sk: Skills, limit: Optional[int] = Query(None, ge=1), current_user: Optional[Principal] = Depends(get_current_user) or None):
+    catalog = career_catalog.current
+    matcher = catalog.matcher
+    user_ids = matcher.parse(sk.user_skills)
+    # parse() normalizes and drops unknown skills, so every spelling and order of one skill set shares an entry
+    top = response_cache.fetch(("advise", tuple(sorted(user_ids)), limit), catalog,
+                               lambda: [matcher.result(idx, user_ids) for idx in matcher.rank(user_ids, limit)])
     tips = "Focus on missing skills, build 2 projects, and network."
-    return {"top_careers": out, "personalized_tips": tips, "timestamp": datetime.utcnow().isoformat()}
+    body = b'{"top_careers":' + top.body + b',"personalized_tips":' + fast_json.dumps(tips) \
+        + b',"timestamp":' + fast_json.dumps(datetime.utcnow().isoformat()) + b"}"
+    return Response(body, media_type="application/json", headers={"ETag": top.etag})
+
+# --- Batch advice: JSON list or NDJSON in, NDJSON out ---
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+# identical skill sets within one batch are matched once; the memo holds encoded top_careers
+# lists (about 250 bytes per career without a limit), so it is bounded by their total size
+BATCH_MEMO_MAX_BYTES = int(os.getenv("BATCH_MEMO_MAX_BYTES", str(16 * 1024 * 1024)))
+
+async def _spool_body(request: Request, max_size=1024 * 1024):
+    # the response streams while we produce it, so the request body is drained into a
+    # spooled temp file first (memory-bounded, spills to disk) instead of read concurrently
+    spool = tempfile.SpooledTemporaryFile(max_size=max_size)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+async def _file_lines(f):
+    try:
+        for line in f:
+            yield line
+    finally:
+        f.close()
+
+async def _json_items(items):
+    for item in items:
+        yield item
+
+def _batch_item_skills(item):
+    if isinstance(item, bytes):
+        item = json.loads(item)  # NDJSON line; JSONDecodeError is a ValueError
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict) and isinstance(item.get("user_skills"), str):
+        return item["user_skills"]
+    raise ValueError('expected a skill string or {"user_skills": "..."}')
+
+async def _advise_batch_stream(items, limit):
+    matcher = career_catalog.current.matcher  # one catalog snapshot for the whole batch
+    memo, memo_bytes = {}, 0
+    index = 0
+    async for item in items:
+        if isinstance(item, bytes) and not item.strip():
+            continue
+        try:
+            skills = _batch_item_skills(item)
+        except ValueError as e:
+            yield fast_json.dumps({"index": index, "error": str(e)}) + b"\n"
+            index += 1
+            continue
+        user_ids = matcher.parse(skills)
+        key = frozenset(user_ids)
+        top = memo.get(key)
+        if top is None:
+            top = fast_json.dumps([matcher.result(idx, user_ids) for idx in matcher.rank(user_ids, limit)])
+            if len(top) <= BATCH_MEMO_MAX_BYTES:
+                if memo_bytes + len(top) > BATCH_MEMO_MAX_BYTES:
+                    memo.clear()
+                    memo_bytes = 0
+                memo[key] = top
+                memo_bytes += len(top)
+        # splice the memoized top_careers JSON into the line instead of re-encoding it
+        yield fast_json.dumps({"index": index, "user_skills": skills})[:-1] + b',"top_careers":' + top + b"}\n"
+        index += 1
+        if index % 256 == 0:
+            await asyncio.sleep(0)  # let other requests run during large in-memory batches
+
+@app.post("/advise/batch")
+async def advise_batch(request: Request, limit: Optional[int] = Query(None, ge=1), current_user: Principal = Depends(get_current_user)):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        items = _file_lines(await _spool_body(request))
+    elif content_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Expected an NDJSON file in the 'file' field")
+        items = _file_lines(upload.file)
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON list or NDJSON")
+        if isinstance(body, dict):
+            body = body.get("items")
+        if not isinstance(body, list):
+            raise HTTPException(status_code=400, detail='Expected a list of skill strings or {"items": [...]}')
+        items = _json_items(body)
+    return StreamingResponse(_advise_batch_stream(items, limit), media_type="application/x-ndjson")
 
 @app.post("/save", status_code=201)
-def save_recommendation(body: SavePayload, current_user: User = Depends(get_current_user), db=Depends(get_db)):
-    rec = SavedRecommendation(user_id=current_user.id, title=body.title, data=json.dumps(body.payload))
-    db.add(rec); db.commit(); db.refresh(rec)
+async def save_recommendation(body: SavePayload, current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    kind, top_career, top_score = summarize_payload(body.payload)
+    rec = SavedRecommendation(user_id=current_user.id, title=body.title, data=json.dumps(body.payload),
+                              kind=kind, top_career=top_career, top_score=top_score)
+    async with db_write_slot(db):
+        db.add(rec); await db.flush()
+        await db.run_sync(badges_on_save, current_user.id, rec)
+        await db.commit()
     return {"id": rec.id, "title": rec.title, "created_at": rec.created_at.isoformat()}
 
+# Keyset pagination: the cursor is the (created_at, id) of the last row returned, so each
+# page is a range scan on the (user_id, created_at, id) index however deep the client goes
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_select(stmt, model, limit: Optional[int], after: Optional[str]):
+    if after:
+        created_at, row_id = decode_cursor(after)
+        stmt = stmt.where(or_(model.created_at < created_at, and_(model.created_at == created_at, model.id < row_id)))
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc())
+    return stmt if limit is None else stmt.limit(limit + 1)  # one extra row says whether a next page exists
+
+async def keyset_page(db, stmt, model, limit: Optional[int], after: Optional[str]):
+    rows = (await db.execute(keyset_select(stmt, model, limit, after))).all()
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+def history_summary_select():
+    SR = SavedRecommendation
+    return select(SR.id, SR.title, SR.kind, SR.top_career, SR.top_score, SR.created_at)
+
+def history_summary_item(it):
+    return {"id": it.id, "title": it.title, "kind": it.kind, "top_career": it.top_career,
+            "top_score": it.top_score, "created_at": it.created_at.isoformat()}
+
+def _history_parts(rows, next_cursor):
+    # stored JSON is spliced into the response as-is, never decoded and re-encoded
+    yield b'{"history":['
+    for i, (row_id, title, data, created_at) in enumerate(rows):
+        yield b'%s{"id":%d,"title":%s,"data":%s,"created_at":"%s"}' % (
+            b"," if i else b"", row_id, fast_json.dumps(title), (data or "null").encode("utf-8"), created_at.isoformat().encode())
+    yield b'],"next_cursor":%s}' % fast_json.dumps(next_cursor)
+
 @app.get("/history")
-def get_history(current_user: User = Depends(get_current_user), db=Depends(get_db)):
-    items = db.query(SavedRecommendation).filter(SavedRecommendation.user_id == current_user.id).order_by(SavedRecommendation.created_at.desc()).all()
-    out = []
-    for it in items:
-        out.append({"id": it.id, "title": it.title, "data": json.loads(it.data), "created_at": it.created_at.isoformat()})
-    return {"history": out}
+async def get_history(limit: Optional[int] = Query(None, ge=1, le=500), after: Optional[str] = None,
+                      fields: str = Query("full", pattern="^(full|summary|raw)$"),
+                      current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    # fields=summary: denormalized columns only; full: stored JSON spliced in undecoded; raw: the
+    # same as full, streamed
+    SR = SavedRecommendation
+    if fields == "summary":
+        stmt = history_summary_select()
+    else:
+        stmt = select(SR.id, SR.title, SR.data, SR.created_at)
+    stmt = stmt.where(SR.user_id == current_user.id)
+    items, next_cursor = await keyset_page(db, stmt, SR, limit, after)
+    if fields == "raw":
+        return StreamingResponse(_history_parts(items, next_cursor), media_type="application/json")
+    if fields == "full":
+        return Response(b"".join(_history_parts(items, next_cursor)), media_type="application/json")
+    return FastJSONResponse({"history": [history_summary_item(it) for it in items], "next_cursor": next_cursor})
 
 # --- Resume Upload & Parse ---
+# PyPDF2 is CPU-bound, so extraction runs in worker processes, never on the event loop
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_MAX_PENDING = int(os.getenv("PDF_MAX_PENDING", str(PDF_WORKERS * 4)))
+PDF_TIMEOUT_SECONDS = float(os.getenv("PDF_TIMEOUT_SECONDS", "10"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+
+pdf_pool = BoundedProcessPool(PDF_WORKERS, PDF_MAX_PENDING, PDF_TIMEOUT_SECONDS)
+
+@app.exception_handler(PoolBusy)
+async def pool_busy_handler(request: Request, exc: PoolBusy):
+    return JSONResponse(status_code=503, content={"detail": "Server busy, please retry"}, headers={"Retry-After": "1"})
+
+async def run_pdf_stage(pool: BoundedProcessPool, stage: str, fn, *args):
+    # records the worker's own time and the wall time from submit (queueing included) per outcome
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        result, seconds = await pool.run(timed_call, fn, *args)
+        metrics.pdf_work.observe((stage,), seconds)
+        outcome = "ok"
+        return result
+    except PoolBusy:
+        outcome = "busy"
+        raise
+    except PoolTimeout:
+        outcome = "timeout"
+        raise
+    finally:
+        metrics.pdf_wall.observe((stage, outcome), time.perf_counter() - start)
+
+async def extract_pdf_text(contents: bytes) -> str:
+    return await run_pdf_stage(pdf_pool, "extract", extract_text, contents, PDF_MAX_PAGES)
+
+# Streamlit posts the same file to /upload_resume and /resume_enhance (and again on every
+# rerun), so extracted text and derived skills are cached by a hash of the file bytes. The
+# optional disk tier (RESUME_CACHE_DIR) is read and written in the threadpool, never on the loop,
+# and is pruned least-recently-modified first past RESUME_CACHE_DISK_MAX_BYTES (0: unbounded).
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR") or None
+RESUME_CACHE_DISK_MAX_BYTES = int(os.getenv("RESUME_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+
+resume_cache = ResumeCache(RESUME_CACHE_MAX_BYTES, RESUME_CACHE_DIR, RESUME_CACHE_DISK_MAX_BYTES)
+_resume_inflight = {}  # key -> Future, so concurrent uploads of one file parse it once
+
+async def cached_resume(key: str):
+    entry = resume_cache.get(key)
+    if entry is None and resume_cache.disk_dir:
+        entry = resume_cache.from_disk(key, await run_in_threadpool(resume_cache.read_disk, key))
+    return entry
+
+async def store_resume(key: str, entry: dict) -> dict:
+    resume_cache.put(key, entry)
+    if resume_cache.disk_dir:
+        await run_in_threadpool(resume_cache.write_disk, key, entry)
+    return entry
+
+async def resume_entry(contents: bytes):
+    key = content_key(contents)
+    entry = await cached_resume(key)
+    if entry is not None:
+        return key, entry
+    fut = _resume_inflight.get(key)
+    if fut is not None:
+        return key, await asyncio.shield(fut)
+    fut = _resume_inflight[key] = asyncio.get_running_loop().create_future()
+    try:
+        entry = await store_resume(key, {"text": await extract_pdf_text(contents)})
+        fut.set_result(entry)
+        return key, entry
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # waiters re-raise it; don't warn when there are none
+        raise
+    finally:
+        del _resume_inflight[key]
+
+def extract_resume_skills(text: str, extractor):
+    # one pass over the text for all catalog skills (and aliases), whole words only
+    return sorted(extractor.find(text))
+
 @app.post("/upload_resume")
-async def upload_resume(file: UploadFile = File(...), current_user: User = Depends(get_current_user)):
+async def upload_resume(file: UploadFile = File(...), current_user: Principal = Depends(get_current_user)):
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF resumes supported")
     contents = await file.read()
     try:
-        reader = PdfReader(io.BytesIO(contents))
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
+        key, entry = await resume_entry(contents)
+    except PoolBusy:
+        raise
     except Exception:
-        # fallback: return raw bytes length
-        text = ""
-    # naive skill extraction: match career_db skills
-    found = set()
-    for skills in (d["required_skills"] for d in career_db.values()):
-        for s in skills:
-            if s.lower() in text.lower():
-                found.add(s.capitalize())
-    return {"extracted_text_snippet": text[:200], "extracted_skills": sorted(list(found))}
+        # fallback: unreadable or timed-out PDFs yield no text (and are not cached)
+        return {"extracted_text_snippet": "", "extracted_skills": []}
+    text = entry["text"]
+    extractor = career_catalog.current.extractor
+    if entry.get("skills_fp") != extractor.fingerprint:
+        entry = await store_resume(key, {**entry, "skills": extract_resume_skills(text, extractor), "skills_fp": extractor.fingerprint})
+    return {"extracted_text_snippet": text[:200], "extracted_skills": entry["skills"]}
+
+@app.get("/stats")
+def stats():
+    return {"resume_cache": resume_cache.stats(), "auth_cache": principal_cache.stats(), "career_catalog": career_catalog.stats(), "quiz_stats": quiz_stats.stats(),
+            "password_hashing": hashing_pool.stats(), "report_cache": report_cache.stats(), "response_cache": response_cache.stats(),
+            "job_trends": trend_store.stats() if trend_store is not None else None}
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    # async on purpose: rendering on the event loop thread means no request updates the metrics mid-render
+    metrics.pdf_pending.set(("extract",), pdf_pool.pending)
+    metrics.pdf_pending.set(("render",), render_pool.pending)
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # --- Badges (simple rules) ---
-@app.get("/badges")
-def badges(current_user: User = Depends(get_current_user), db=Depends(get_db)):
-    earned = []
-
-    # --- Career Recommendation Badges ---
-    items = db.query(SavedRecommendation).filter(SavedRecommendation.user_id == current_user.id).all()
-    if items:
-        earned.append({
-            "id": "first_save",
-            "name": "💾 First Save",
-            "earned_at": items[0].created_at.isoformat()
-        })
-    for it in items:
+# The rules (badge_rules.py) are applied incrementally as a side effect of /save and /submit_quiz
+# and stored in user_badges, so /badges is one indexed read. compute_badges() is the same rule
+# logic evaluated from scratch; migration 4 backfilled existing users with it, and manage.py
+# uses it to rebuild and to check consistency.
+def _award_badge(db, user_id: int, rule: str, earned_at: datetime, badge_id: Optional[str] = None, name: Optional[str] = None):
+    # first award wins: an existing (user, rule) row is left alone, so repeat saves and concurrent
+    # requests don't trip uq_user_badges_user_rule
+    values = dict(user_id=user_id, rule=rule, badge_id=badge_id or rule, name=name or BADGE_NAMES[rule], earned_at=earned_at)
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        db.execute(sqlite_insert(UserBadge).values(**values).on_conflict_do_nothing())
+    elif dialect == "postgresql":
+        db.execute(postgresql_insert(UserBadge).values(**values).on_conflict_do_nothing())
+    elif dialect in ("mysql", "mariadb"):
+        db.execute(insert(UserBadge).prefix_with("IGNORE").values(**values))
+    else:
         try:
-            d = json.loads(it.data)
-            top0 = d.get("top_careers", [])[0] if d.get("top_careers") else None
-            if top0 and top0.get("match_score", 0) >= 80:
-                earned.append({
-                    "id": "top_match",
-                    "name": "🌟 High Match (>=80%)",
-                    "earned_at": it.created_at.isoformat()
-                })
-                break
-        except Exception:
-            continue
+            with db.begin_nested():
+                db.execute(insert(UserBadge).values(**values))
+        except IntegrityError:
+            pass
+
+def badges_on_save(db, user_id: int, rec: SavedRecommendation):
+    _award_badge(db, user_id, "first_save", rec.created_at)
+    if rec.kind == "advice" and (rec.top_score or 0) >= TOP_MATCH_MIN_SCORE:
+        _award_badge(db, user_id, "top_match", rec.created_at)
+    if is_resume_title(rec.title):
+        _award_badge(db, user_id, "resume_ready", rec.created_at)
+
+def badges_on_quiz(db, user_id: int, rec: QuizScore):
+    if is_perfect_quiz(rec.score, rec.total):
+        badge_id, name = quiz_master_badge(rec.career)
+        _award_badge(db, user_id, "quiz_master", rec.created_at, badge_id, name)
+    taken = db.query(func.count(QuizScore.id)).filter(QuizScore.user_id == user_id).scalar()
+    if taken >= QUIZ_FANATIC_MIN_QUIZZES:
+        # dated by the latest quiz, so it moves forward with every attempt
+        updated = db.execute(update(UserBadge).where(UserBadge.user_id == user_id, UserBadge.rule == "quiz_fanatic")
+                             .values(earned_at=rec.created_at)).rowcount
+        if not updated:
+            _award_badge(db, user_id, "quiz_fanatic", rec.created_at)
+
+def compute_badges(db, user_id: int):
+    # full-scan evaluation of the rules: {rule: (badge_id, name, earned_at)}
+    SR, QS = SavedRecommendation, QuizScore
+    saves = db.execute(select(SR.title, SR.data, SR.created_at).where(SR.user_id == user_id).order_by(SR.id))
+    quizzes = db.execute(select(QS.career, QS.score, QS.total, QS.created_at).where(QS.user_id == user_id).order_by(QS.id))
+    return earned_badges(saves, quizzes)
+
+def materialized_badges(db, user_id: int):
+    rows = db.query(UserBadge).filter(UserBadge.user_id == user_id).all()
+    return {b.rule: (b.badge_id, b.name, b.earned_at) for b in rows}
+
+def badge_items(earned):
+    return [{"id": earned[rule][0], "name": earned[rule][1], "earned_at": earned[rule][2].isoformat()}
+            for rule in BADGE_RULES if rule in earned]
+
+def rebuild_user_badges(db, user_id: int):
+    db.query(UserBadge).filter(UserBadge.user_id == user_id).delete()
+    for rule, (badge_id, name, earned_at) in compute_badges(db, user_id).items():
+        db.add(UserBadge(user_id=user_id, rule=rule, badge_id=badge_id, name=name, earned_at=earned_at))
+
+@app.get("/badges")
+async def badges(current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    return {"badges": badge_items(await db.run_sync(materialized_badges, current_user.id))}
+
+# --- Job trends ---
+# Served from JOB_POSTINGS_PATH (CSV, or Parquet with pyarrow) when that file exists. The first
+# start ingests it and writes <path>.trends.npz next to it; later starts load that in a second
+# until the postings file changes. `python manage.py ingest-job-trends` does the ingest ahead of time.
+JOB_POSTINGS_PATH = os.getenv("JOB_POSTINGS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "job_postings.csv"))
+trend_store = None
+
+def open_trend_store():
+    return TrendStore.open(JOB_POSTINGS_PATH) if os.path.exists(JOB_POSTINGS_PATH) else None
 
-    # --- Quiz Badges ---
-    quiz_items = db.query(QuizScore).filter(QuizScore.user_id == current_user.id).all()
-    for q in quiz_items:
-        if q.score == len(quiz_bank.get(q.career, [])):  # perfect score
-            earned.append({
-                "id": f"quiz_master_{q.career.lower()}",
-                "name": f"🎓 Quiz Master ({q.career})",
-                "earned_at": q.created_at.isoformat()
-            })
-            break
-    if len(quiz_items) >= 5:
-        earned.append({
-            "id": "quiz_fanatic",
-            "name": "🔥 Quiz Fanatic (5+ quizzes taken)",
-            "earned_at": quiz_items[-1].created_at.isoformat()
-        })
-
-    # --- Resume Badges (simple rules) ---
-    # idea: award when user uploads/enhances resume successfully
-    resume_flag = db.query(SavedRecommendation).filter(
-        SavedRecommendation.user_id == current_user.id,
-        SavedRecommendation.title.like("%Resume%")
-    ).first()
-
-    if resume_flag:
-        earned.append({
-            "id": "resume_ready",
-            "name": "📄 Resume Ready (uploaded & enhanced)",
-            "earned_at": resume_flag.created_at.isoformat()
-        })
-
-    return {"badges": earned}
-
-# --- Job trends (mock) ---
 @app.get("/job_trends")
-def job_trends(q: Optional[str] = None):
-    # return mock time series
+def job_trends(request: Request, q: Optional[str] = None, from_: Optional[str] = Query(None, alias="from"), to: Optional[str] = None,
+               granularity: str = Query("month", pattern="^(month|quarter)$")):
+    store = trend_store
+    if store is None:
+        return mock_job_trends(q)
+    try:
+        start = parse_period(from_) if from_ else None
+        end = parse_period(to, end=True) if to else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    row = store.lookup(q)
+    if row is None:
+        raise HTTPException(status_code=404, detail="No postings for this skill or career")
+    # keyed on the resolved row, so "Python", " python" and "PYTHON" share an entry
+    trend = response_cache.fetch(("job_trends", row, granularity, start, end), store,
+                                 lambda: store.query(row, granularity, start, end))
+    body = fast_json.dumps({"query": q or "all", "granularity": granularity})[:-1] + b',"trend":' + trend.body + b"}"
+    return cached_response(request, trend, body)
+
+def mock_job_trends(q: Optional[str] = None):
+    # no postings dataset: the original mock time series
     labels = ["2024-01","2024-04","2024-07","2024-10","2025-01","2025-04","2025-07","2025-09"]
     base = [40,45,48,52,55,58,60,63]
     return {"query": q or "all", "trend": [{"date":d,"demand_index":base[i%len(base)] + (i%3)*2} for i,d in enumerate(labels)]}
 
-# --- Export recommendation to PDF (simple) ---
 # --- Export recommendation or resume to PDF ---
-@app.post("/export_pdf")
-def export_pdf(payload: dict, current_user: User = Depends(get_current_user)):
-    try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.pdfgen import canvas
-
-        buffer = io.BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        textobject = c.beginText(40, 750)
-        textobject.setFont("Helvetica", 12)
-
-        # Common header
-        textobject.textLine("AI Career Advisor Report")
-        textobject.moveCursor(0, 18)
-        textobject.textLine(f"Generated: {datetime.utcnow().isoformat()}")
-        textobject.moveCursor(0, 24)
-
-        # --- Case 1: Career Recommendation ---
-        if "top_careers" in payload:
-            textobject.textLine("=== Career Recommendations ===")
-            for idx, cobj in enumerate(payload.get("top_careers", []), start=1):
-                textobject.moveCursor(0, 16)
-                textobject.textLine(f"{idx}. {cobj.get('career')} - Match: {cobj.get('match_score')}%")
-                if cobj.get("matched_skills"):
-                    textobject.moveCursor(0, 14)
-                    textobject.textLine(f"   Matched: {', '.join(cobj['matched_skills'])}")
-                if cobj.get("missing_skills"):
-                    textobject.moveCursor(0, 14)
-                    textobject.textLine(f"   Missing: {', '.join(cobj['missing_skills'])}")
-
-        # --- Case 2: Resume Enhancement ---
-        elif "suggestions" in payload or "skills" in payload:
-            textobject.textLine("=== Resume Enhancement Report ===")
-            skills = payload.get("skills", [])
-            suggestions = payload.get("suggestions", [])
-            if skills:
-                textobject.moveCursor(0, 16)
-                textobject.textLine(f"Extracted Skills: {', '.join(skills)}")
-            if suggestions:
-                textobject.moveCursor(0, 20)
-                textobject.textLine("Improvement Suggestions:")
-                for s in suggestions:
-                    textobject.moveCursor(0, 14)
-                    textobject.textLine(f"- {s}")
-
-        else:
-            textobject.textLine("No data provided.")
-
-        c.drawText(textobject)
-        c.showPage()
-        c.save()
-        buffer.seek(0)
-
-        return StreamingResponse(
-            buffer,
-            media_type="application/pdf",
-            headers={"Content-Disposition": "attachment; filename=advisor_report.pdf"}
-        )
+# ReportLab rendering runs in its own worker pool (so exports never delay resume parsing),
+# and finished reports are cached by payload hash: re-exporting the same advice is free
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+PDF_RENDER_MAX_PENDING = int(os.getenv("PDF_RENDER_MAX_PENDING", str(PDF_RENDER_WORKERS * 4)))
+PDF_RENDER_TIMEOUT_SECONDS = float(os.getenv("PDF_RENDER_TIMEOUT_SECONDS", "15"))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PDF_STREAM_CHUNK = 64 * 1024
 
-    except Exception:
-        # fallback: send plain text JSON
-        b = io.BytesIO(json.dumps(payload, indent=2).encode("utf-8"))
-        return StreamingResponse(
-            b,
-            media_type="application/octet-stream",
-            headers={"Content-Disposition": "attachment; filename=advisor_report.json"}
-        )
+render_pool = BoundedProcessPool(PDF_RENDER_WORKERS, PDF_RENDER_MAX_PENDING, PDF_RENDER_TIMEOUT_SECONDS)
+report_cache = ReportCache(REPORT_CACHE_MAX_BYTES)
 
-class QuizScore(Base):
-    __tablename__ = "quiz_scores"
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    career = Column(String, index=True)
-    score = Column(Integer)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    owner = relationship("User")
+def _byte_chunks(data: bytes, size: int = PDF_STREAM_CHUNK):
+    view = memoryview(data)
+    for i in range(0, len(view), size):
+        yield view[i:i + size]
 
-Base.metadata.create_all(bind=engine)
+@app.post("/export_pdf")
+async def export_pdf(payload: dict, current_user: Principal = Depends(get_current_user)):
+    key = report_key(payload)
+    pdf = report_cache.get(key)
+    if pdf is None:
+        try:
+            pdf = await run_pdf_stage(render_pool, "render", render_report, payload, datetime.utcnow().isoformat())
+        except PoolBusy:
+            raise
+        except Exception:
+            # fallback: send plain text JSON
+            b = io.BytesIO(fast_json.dumps(payload, indent=True))
+            return StreamingResponse(
+                b,
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": "attachment; filename=advisor_report.json"}
+            )
+        report_cache.put(key, pdf)
+    return StreamingResponse(
+        _byte_chunks(pdf),
+        media_type="application/pdf",
+        headers={"Content-Disposition": "attachment; filename=advisor_report.pdf", "Content-Length": str(len(pdf))}
+    )
+
+# --- Quiz ---
+# Questions live in quiz_questions; answers never leave the server. Grading is by question id
+# against that table, so clients can't score themselves by position. manage.py import-quiz-bank
+# adds questions; an empty table is seeded from QUIZ_BANK_PATH at startup.
+QUIZ_BANK_PATH = os.getenv("QUIZ_BANK_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "quiz_bank.json"))
+QUIZ_DEFAULT_DIFFICULTY = "medium"
+QUIZ_MAX_QUESTIONS = 50      # per quiz, and per submission
+QUIZ_MAX_BATCH = 100         # submissions per /submit_quiz/batch call
+QUIZ_COUNTS_TTL_SECONDS = float(os.getenv("QUIZ_COUNTS_TTL_SECONDS", "60"))
+QUIZ_TOKEN_TTL_SECONDS = int(os.getenv("QUIZ_TOKEN_TTL_SECONDS", "3600"))  # time to answer a served quiz
 
-# --- Mock Quiz Questions ---
-quiz_bank = {
-    "Python": [
-        {"q": "What is the output of len([1,2,3])?", "options": ["2","3","4"], "a": "3"},
-        {"q": "Which keyword defines a function?", "options": ["func","def","lambda"], "a": "def"},
-    ],
-    "SQL": [
-        {"q": "Which SQL keyword retrieves data?", "options": ["SELECT","UPDATE","INSERT"], "a": "SELECT"},
-        {"q": "What does PRIMARY KEY ensure?", "options": ["Uniqueness","Speed","Null values"], "a": "Uniqueness"},
-    ]
-}
 class QuizSubmission(BaseModel):
     career: str
-    answers: dict
+    quiz_token: str  # from /quiz_questions; names the questions that were served
+    answers: dict  # question id -> chosen option
+
+class QuizBatch(BaseModel):
+    submissions: List[QuizSubmission]
 
 import random
 
+def import_quiz_questions(db, bank: dict) -> int:
+    # bank: {career: [{"q", "options", "a", "difficulty"?}, ...]}; appends after existing questions
+    QQ = QuizQuestion
+    next_seq = {(c, d): n + 1 for c, d, n in
+                db.query(QQ.career, QQ.difficulty, func.max(QQ.seq)).group_by(QQ.career, QQ.difficulty)}
+    rows = []
+    for career, questions in bank.items():
+        for q in questions:
+            slot = (career, q.get("difficulty") or QUIZ_DEFAULT_DIFFICULTY)
+            seq = next_seq.get(slot, 0)
+            next_seq[slot] = seq + 1
+            rows.append({"career": career, "difficulty": slot[1], "seq": seq, "question": q["q"],
+                         "options": json.dumps(q["options"]), "answer": q["a"]})
+    if rows:
+        db.execute(insert(QuizQuestion), rows)
+    return len(rows)
+
+def seed_quiz_bank():
+    db = SessionLocal()
+    try:
+        if db.query(QuizQuestion.id).first() is None and os.path.exists(QUIZ_BANK_PATH):
+            with open(QUIZ_BANK_PATH, encoding="utf-8") as f:
+                import_quiz_questions(db, json.load(f))
+            db.commit()
+    finally:
+        db.close()
+
+seed_quiz_bank()
+
+# (career, difficulty) -> number of questions; one grouped count per TTL, not per request.
+# Imports only append, so a stale count just leaves the newest questions out until refresh.
+_quiz_counts = {"at": float("-inf"), "counts": {}}
+
+async def quiz_slot_counts(db, career: str) -> dict:
+    now = asyncio.get_running_loop().time()
+    if now - _quiz_counts["at"] >= QUIZ_COUNTS_TTL_SECONDS:
+        QQ = QuizQuestion
+        rows = await db.execute(select(QQ.career, QQ.difficulty, func.count()).group_by(QQ.career, QQ.difficulty))
+        counts = {}
+        for c, d, n in rows:
+            counts.setdefault(c, {})[d] = n
+        _quiz_counts.update(at=now, counts=counts)
+    return _quiz_counts["counts"].get(career, {})
+
 @app.get("/quiz_questions")
-def quiz_questions(career: str = "Python", limit: int = 2):
-    questions = quiz_bank.get(career, [])
-    if not questions:
+async def quiz_questions(career: str = "Python", limit: int = Query(2, ge=1, le=QUIZ_MAX_QUESTIONS),
+                         difficulty: Optional[str] = None, db=Depends(get_async_db)):
+    counts = await quiz_slot_counts(db, career)
+    if difficulty is not None:
+        counts = {difficulty: counts[difficulty]} if difficulty in counts else {}
+    total = sum(counts.values())
+    if not total:
         raise HTTPException(status_code=404, detail="No quiz available for this career")
-    # Randomly select questions (default = 2)
-    selected = random.sample(questions, min(limit, len(questions)))
-    return {"career": career, "questions": selected}
+    # k distinct positions over the concatenated slots, each mapped to its (difficulty, seq)
+    picks, offset = {}, 0
+    slots = sorted(counts.items())
+    order = random.sample(range(total), min(limit, total))
+    for pos in sorted(order):
+        while pos >= offset + slots[0][1]:
+            offset += slots.pop(0)[1]
+        picks[pos] = (slots[0][0], pos - offset)
+    QQ = QuizQuestion
+    by_slot = {}
+    for d, seq in picks.values():
+        by_slot.setdefault(d, []).append(seq)
+    rows = await db.execute(select(QQ.id, QQ.difficulty, QQ.seq, QQ.question, QQ.options).where(
+        QQ.career == career, or_(*(and_(QQ.difficulty == d, QQ.seq.in_(seqs)) for d, seqs in by_slot.items()))))
+    found = {(r.difficulty, r.seq): r for r in rows}
+    selected = [found[picks[pos]] for pos in order if picks[pos] in found]
+    return {"career": career, "quiz_token": quiz_token(career, [r.id for r in selected]),
+            "questions": [{"id": r.id, "q": r.question, "options": json.loads(r.options),
+                           "difficulty": r.difficulty} for r in selected]}
+
+# A submission is graded against the questions that were served, not the ones answered: the
+# signed token carries their ids, so leaving questions out or answering a hand-picked one
+# scores them as wrong instead of shrinking the quiz.
+def quiz_token(career: str, question_ids: list) -> str:
+    return jwt.encode({"typ": "quiz", "career": career, "qids": question_ids,
+                       "exp": datetime.utcnow() + timedelta(seconds=QUIZ_TOKEN_TTL_SECONDS)}, SECRET_KEY, algorithm=ALGORITHM)
+
+def served_question_ids(sub: QuizSubmission) -> list:
+    try:
+        claims = jwt.decode(sub.quiz_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=400, detail="Invalid or expired quiz token")
+    if claims.get("typ") != "quiz" or claims.get("career") != sub.career or not claims.get("qids"):
+        raise HTTPException(status_code=400, detail="Quiz token does not match this quiz")
+    return claims["qids"]
+
+def _answer_ids(sub: QuizSubmission) -> dict:
+    if not sub.answers:
+        raise HTTPException(status_code=400, detail="No answers submitted")
+    if len(sub.answers) > QUIZ_MAX_QUESTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {QUIZ_MAX_QUESTIONS} answers per submission")
+    try:
+        return {int(qid): ans for qid, ans in sub.answers.items()}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Answer keys must be question ids")
+
+async def grade_submissions(db, submissions: List[QuizSubmission]) -> list:
+    # one primary-key lookup for every served question in every submission -> [(score, total), ...]
+    served = [served_question_ids(sub) for sub in submissions]
+    answer_sets = [_answer_ids(sub) for sub in submissions]
+    ids = set().union(*served)
+    key = {r.id: r for r in await db.execute(
+        select(QuizQuestion.id, QuizQuestion.career, QuizQuestion.answer).where(QuizQuestion.id.in_(ids)))}
+    graded = []
+    for sub, qids, answers in zip(submissions, served, answer_sets):
+        if not answers.keys() <= set(qids) or any(qid not in key or key[qid].career != sub.career for qid in qids):
+            raise HTTPException(status_code=400, detail=f"Answers must be to the questions served for {sub.career}")
+        graded.append((sum(1 for qid in qids if answers.get(qid) == key[qid].answer), len(qids)))
+    return graded
+
+async def record_quiz_scores(db, user_id: int, submissions: List[QuizSubmission]) -> list:
+    graded = await grade_submissions(db, submissions)
+    recs = [QuizScore(user_id=user_id, career=sub.career, score=score, total=total)
+            for sub, (score, total) in zip(submissions, graded)]
+    async with db_write_slot(db):  # releases the connection grading read with before queueing
+        for rec in recs:
+            db.add(rec); await db.flush()
+            await db.run_sync(badges_on_quiz, user_id, rec)
+        await db.commit()
+    return [{"career": rec.career, "score": rec.score, "total": rec.total,
+             "percentile": quiz_stats.record(user_id, rec.career, rec.score, rec.total, rec.created_at)} for rec in recs]
+
+# Leaderboards and percentiles come from in-memory per-career histograms (quiz_stats.py),
+# loaded from quiz_scores at startup and updated by every submission this process records.
+# With several workers each sees only its own new submissions until its next start.
+quiz_stats = QuizStats()
+
+def load_quiz_stats():
+    db = SessionLocal()
+    try:
+        QS = QuizScore
+        rows = db.execute(select(QS.user_id, QS.career, QS.score, QS.total, QS.created_at)
+                          .order_by(QS.id).execution_options(yield_per=10000))
+        quiz_stats.load(rows)
+    finally:
+        db.close()
+
+def mask_email(email: str) -> str:
+    name, _, domain = email.partition("@")
+    return f"{name[:2]}***@{domain}" if domain else f"{name[:2]}***"
+
+@app.get("/quiz_leaderboard")
+async def quiz_leaderboard(career: str, limit: int = Query(10, ge=1, le=100),
+                           current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    board = quiz_stats.leaderboard(career, limit, current_user.id)
+    ids = [user_id for _, user_id, _, _ in board["leaders"]]
+    emails = dict((await db.execute(select(User.id, User.email).where(User.id.in_(ids)))).all()) if ids else {}
+    return {"career": career, "attempts": board["attempts"], "players": board["players"],
+            "leaders": [{"rank": rank, "user": mask_email(emails.get(user_id, "")), "best_pct": pct,
+                         "reached_at": at.isoformat(), "you": user_id == current_user.id}
+                        for rank, user_id, pct, at in board["leaders"]],
+            "you": board["you"]}
 
 @app.post("/submit_quiz")
-def submit_quiz(body: QuizSubmission, current_user: User = Depends(get_current_user), db=Depends(get_db)):
-    questions = quiz_bank.get(body.career, [])
-    score = sum(1 for i, q in enumerate(questions) if body.answers.get(str(i)) == q["a"])
-    rec = QuizScore(user_id=current_user.id, career=body.career, score=score)
-    db.add(rec); db.commit()
-    return {"career": body.career, "score": score, "total": len(questions)}
+async def submit_quiz(body: QuizSubmission, current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    return (await record_quiz_scores(db, current_user.id, [body]))[0]
+
+@app.post("/submit_quiz/batch")
+async def submit_quiz_batch(body: QuizBatch, current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    # all-or-nothing: one bad submission rejects the batch before anything is stored
+    if not body.submissions or len(body.submissions) > QUIZ_MAX_BATCH:
+        raise HTTPException(status_code=400, detail=f"Expected 1 to {QUIZ_MAX_BATCH} submissions")
+    return {"results": await record_quiz_scores(db, current_user.id, body.submissions)}
 
 # --- Mock Interview ---
+# Questions and their reference concepts come from INTERVIEW_BANK_PATH; answers are scored by
+# TF-IDF similarity to those concepts (interview_scoring.py), with vectors built once here.
+INTERVIEW_BANK_PATH = os.getenv("INTERVIEW_BANK_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "interview_bank.json"))
+with open(INTERVIEW_BANK_PATH, encoding="utf-8") as f:
+    interview_scorer = InterviewScorer(json.load(f))
+
 @app.get("/interview_questions")
-def interview_questions(career: str = "Data Scientist"):
-    base_qs = {
-        "Data Scientist": [
-            "Explain overfitting in ML.",
-            "What is p-value in statistics?",
-            "How would you handle missing data?"
-        ],
-        "Web Developer": [
-            "Explain the difference between GET and POST.",
-            "What is a REST API?",
-            "How does React manage state?"
-        ]
-    }
-    return {"career": career, "questions": base_qs.get(career, ["Tell me about yourself."])}
+def interview_questions(request: Request, career: str = "Data Scientist"):
+    scorer = interview_scorer
+    entry = response_cache.fetch(("interview_questions", career), scorer,
+                                 lambda: {"career": career, "questions": [scorer.question_text[i] for i in scorer.career_questions(career)]})
+    return cached_response(request, entry)
+
+class ConceptMatch(BaseModel):
+    concept: str
+    similarity: float
+
+class AnswerFeedback(BaseModel):
+    question: str
+    answer: str
+    score: int
+    similarity: float
+    closest_concepts: List[ConceptMatch]
+    missing_concepts: List[str]
+    keywords_matched: List[str]
 
-@app.post("/interview_feedback")
-def interview_feedback(career: str, answers: List[str]):
-    # Simple keyword check
+class InterviewFeedback(BaseModel):
+    career: str
+    feedback: List[AnswerFeedback]
+
+@app.post("/interview_feedback", response_model=InterviewFeedback)
+def interview_feedback(career: str, answers: List[str] = Body(..., embed=True)):
+    # answers[i] responds to the i-th question /interview_questions gave for this career
+    questions = interview_scorer.career_questions(career)
+    if len(answers) > len(questions):
+        raise HTTPException(status_code=400, detail=f"Expected at most {len(questions)} answers")
     feedback = []
-    keywords = {
-        "overfitting": ["overfit","generalization","train","test"],
-        "GET vs POST": ["idempotent","data","body","url"],
-    }
-    for ans in answers:
-        matched = [k for k,v in keywords.items() if any(word in ans.lower() for word in v)]
-        feedback.append({"answer": ans, "keywords_matched": matched})
+    for qid, ans, result in zip(questions, answers, interview_scorer.score(career, answers)):
+        feedback.append({"question": interview_scorer.question_text[qid], "answer": ans, **result,
+                         "keywords_matched": [c["concept"] for c in result["closest_concepts"]]})
     return {"career": career, "feedback": feedback}
 
 # --- Resume Enhancer ---
+enhance_keywords = KeywordAutomaton([("team", "team"), ("project", "project")], whole_word=False)
+
 @app.post("/resume_enhance")
 async def resume_enhance(file: UploadFile = File(...)):
     contents = await file.read()
-    reader = PdfReader(io.BytesIO(contents))
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
+    try:
+        text = (await resume_entry(contents))[1]["text"]
+    except PoolTimeout:
+        raise HTTPException(status_code=504, detail="Timed out reading the PDF")
+    found = enhance_keywords.find(text)
     suggestions = []
-    if "team" not in text.lower():
+    if "team" not in found:
         suggestions.append("Add teamwork/leadership examples.")
-    if "project" not in text.lower():
+    if "project" not in found:
         suggestions.append("Mention 1-2 key projects with impact metrics.")
     return {"suggestions": suggestions}
 
 # --- Career Comparison ---
+def career_json(catalog, name: str) -> bytes:
+    # {"name": ..., "required_skills": [...], "roadmap": [...]} from the snapshot's pre-encoded details;
+    # unknown careers are just {"name": ...}
+    details = catalog.details_json.get(name)
+    name_json = b'{"name":' + fast_json.dumps(name)
+    return name_json + b"," + details[1:] if details is not None else name_json + b"}"
+
 @app.get("/compare_careers")
-def compare_careers(c1: str, c2: str):
-    d1, d2 = career_db.get(c1), career_db.get(c2)
-    return {
-        "career1": {"name": c1, **(d1 or {})},
-        "career2": {"name": c2, **(d2 or {})},
-        "salary_estimates": {c1: "₹12 LPA", c2: "₹10 LPA"},
-    }
+def compare_careers(request: Request, c1: str, c2: str):
+    catalog = career_catalog.current
+    return cached_response(request, response_cache.fetch(("compare_careers", c1, c2), catalog, lambda: (
+        b'{"career1":' + career_json(catalog, c1) + b',"career2":' + career_json(catalog, c2)
+        + b',"salary_estimates":' + fast_json.dumps({c1: "₹12 LPA", c2: "₹10 LPA"}) + b"}")))
+
+# --- Similar Careers ---
+# Cosine similarity of IDF-weighted required-skill vectors, precomputed with each catalog
+# snapshot (full matrix for small catalogs, a walk over skill postings for large ones; see career_similarity.py)
+class SimilarCareer(BaseModel):
+    career: str
+    similarity: float
+    shared_skills: List[str]
+
+class SimilarCareers(BaseModel):
+    query: str
+    results: List[SimilarCareer]
+
+@app.get("/similar_careers", response_model=SimilarCareers)
+def similar_careers(career: Optional[str] = None, skills: Optional[str] = None, k: int = Query(5, ge=1, le=50)):
+    if (career is None) == (skills is None):
+        raise HTTPException(status_code=400, detail="Pass exactly one of career or skills")
+    catalog = career_catalog.current
+    matcher = catalog.matcher
+    if career is not None:
+        idx = catalog.index.get(career)
+        if idx is None:
+            raise HTTPException(status_code=404, detail="Unknown career")
+        query_ids = {sid for _, sid in matcher.skill_names[idx]}
+        hits = catalog.similarity.similar_to_career(idx, k)
+    else:
+        query_ids = matcher.parse(skills)
+        hits = catalog.similarity.similar_to_skills(query_ids, k)
+    return {"query": career if career is not None else skills,
+            "results": [{"career": matcher.careers[i], "similarity": round(sim, 3),
+                         "shared_skills": [name for name, sid in matcher.skill_names[i] if sid in query_ids]}
+                        for i, sim in hits]}
 # --- Quiz Scores History ---
-@app.get("/quiz_scores")
-def quiz_scores(current_user: User = Depends(get_current_user), db=Depends(get_db)):
-    items = db.query(QuizScore).filter(QuizScore.user_id == current_user.id).order_by(QuizScore.created_at.desc()).all()
+class QuizScoreItem(BaseModel):
+    career: str
+    score: Optional[int]
+    total: Optional[int]
+    created_at: str
+
+class QuizScoresPage(BaseModel):
+    scores: List[QuizScoreItem]
+    next_cursor: Optional[str]
+
+@app.get("/quiz_scores", response_model=QuizScoresPage)
+async def quiz_scores(limit: Optional[int] = Query(None, ge=1, le=500), after: Optional[str] = None, current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    stmt = quiz_score_select().where(QuizScore.user_id == current_user.id)
+    items, next_cursor = await keyset_page(db, stmt, QuizScore, limit, after)
     out = []
     for it in items:
-        out.append({
-            "career": it.career,
-            "score": it.score,
-            "created_at": it.created_at.isoformat()
-        })
-    return {"scores": out}
+        out.append(quiz_score_item(it))
+    return {"scores": out, "next_cursor": next_cursor}
+
+def quiz_score_select():
+    return select(QuizScore.id, QuizScore.career, QuizScore.score, QuizScore.total, QuizScore.created_at)
+
+def quiz_score_item(it):
+    return {
+        "career": it.career,
+        "score": it.score,
+        "total": it.total,
+        "created_at": it.created_at.isoformat()
+    }
+
+# --- Dashboard ---
+# First pages of history (summary fields) and quiz scores plus badges, in one round trip on one
+# session. Every write a user makes (/save, /submit_quiz, and the badges they award) is stamped
+# with its created_at, so the latest of those timestamps versions the whole dashboard.
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag.removeprefix("W/") for t in tags)
+
+async def dashboard_etag(db, user_id: int, limit: int) -> str:
+    SR, QS = SavedRecommendation, QuizScore
+    # each max() is one seek on its (user_id, created_at, id) index
+    last_save, last_quiz = (await db.execute(select(
+        select(func.max(SR.created_at)).where(SR.user_id == user_id).scalar_subquery(),
+        select(func.max(QS.created_at)).where(QS.user_id == user_id).scalar_subquery()))).one()
+    return 'W/"%d-%s-%s-%d"' % (user_id, last_save or 0, last_quiz or 0, limit)
+
+class HistorySummaryItem(BaseModel):
+    id: int
+    title: Optional[str]
+    kind: Optional[str]
+    top_career: Optional[str]
+    top_score: Optional[float]
+    created_at: str
+
+class BadgeItem(BaseModel):
+    id: str
+    name: str
+    earned_at: str
+
+class Dashboard(BaseModel):
+    history: List[HistorySummaryItem]
+    history_next_cursor: Optional[str]
+    badges: List[BadgeItem]
+    scores: List[QuizScoreItem]
+    scores_next_cursor: Optional[str]
+
+@app.get("/dashboard", response_model=Dashboard)
+async def dashboard(request: Request, response: Response, limit: int = Query(10, ge=1, le=100),
+                    current_user: Principal = Depends(get_current_user), db=Depends(get_async_db)):
+    etag = await dashboard_etag(db, current_user.id, limit)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    history, history_next = await keyset_page(
+        db, history_summary_select().where(SavedRecommendation.user_id == current_user.id), SavedRecommendation, limit, None)
+    scores, scores_next = await keyset_page(
+        db, quiz_score_select().where(QuizScore.user_id == current_user.id), QuizScore, limit, None)
+    earned = await db.run_sync(materialized_badges, current_user.id)
+    response.headers.update(headers)
+    return {
+        "history": [history_summary_item(it) for it in history], "history_next_cursor": history_next,
+        "badges": badge_items(earned),
+        "scores": [quiz_score_item(it) for it in scores], "scores_next_cursor": scores_next,
+    }
@@ -0,0 +1,120 @@
+# api_client.py
+# The one way Streamlit pages talk to the API: a keep-alive session shared by every page and
+# browser session, default timeouts, retries for idempotent calls, and short-lived caches for
+# read-only endpoints. Writes made through post() drop the cache entries they make stale.
+import os, time
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+FASTAPI_URL = os.getenv("FASTAPI_URL", "http://127.0.0.1:8000")
+TIMEOUT = (3.05, 30)  # connect, read (seconds); PDF endpoints time out server-side well before this
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "16"))
+
+# read-only endpoints whose answers don't depend on the caller
+CATALOG_TTL_SECONDS = 3600
+JOB_TRENDS_TTL_SECONDS = 600
+# the dashboard is re-read on every rerun; within this window it is served from session_state,
+# after it the server is asked again with If-None-Match (usually a 304)
+DASHBOARD_FRESH_SECONDS = 30
+
+
+@st.cache_resource
+def http() -> requests.Session:
+    # GETs are retried on connection errors and 502/503/504 (honouring Retry-After);
+    # POSTs are never retried, so a write is never applied twice
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset({"GET", "HEAD"}), respect_retry_after_header=True, raise_on_status=False)
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry))
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry))
+    return session
+
+
+def auth_headers(token=None) -> dict:
+    token = token or st.session_state.get("token")
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def request(method: str, path: str, token=None, headers=None, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", TIMEOUT)
+    r = http().request(method, f"{FASTAPI_URL}{path}", headers={**auth_headers(token), **(headers or {})}, **kwargs)
+    if method != "GET" and r.ok:
+        invalidate(path)
+    return r
+
+
+def get(path: str, token=None, **kwargs) -> requests.Response:
+    return request("GET", path, token, **kwargs)
+
+
+def post(path: str, token=None, **kwargs) -> requests.Response:
+    return request("POST", path, token, **kwargs)
+
+
+# --- Cached reads ---
+# st.cache_data entries are shared by every browser session, so only caller-independent
+# endpoints go here. Failures raise and are therefore never cached.
+def _json(path: str, **params):
+    r = get(path, params=params)
+    r.raise_for_status()
+    return r.json()
+
+
+@st.cache_data(ttl=JOB_TRENDS_TTL_SECONDS, show_spinner=False)
+def job_trends(q: str, granularity: str = "month") -> dict:
+    return _json("/job_trends", q=q, granularity=granularity)
+
+
+@st.cache_data(ttl=CATALOG_TTL_SECONDS, show_spinner=False)
+def compare_careers(c1: str, c2: str) -> dict:
+    return _json("/compare_careers", c1=c1, c2=c2)
+
+
+@st.cache_data(ttl=CATALOG_TTL_SECONDS, show_spinner=False)
+def interview_questions(career: str) -> dict:
+    return _json("/interview_questions", career=career)
+
+
+def dashboard(limit: int, token=None):
+    # per user, so it lives in session_state rather than st.cache_data:
+    # {"etag", "body", "token", "limit", "checked"}, or None if the API didn't answer
+    token = token or st.session_state.get("token")
+    entry = st.session_state.get("_api_dashboard")
+    if entry is not None and (entry["token"], entry["limit"]) != (token, limit):
+        entry = None
+    now = time.monotonic()
+    if entry is not None and now - entry["checked"] < DASHBOARD_FRESH_SECONDS:
+        return entry
+    headers = {"If-None-Match": entry["etag"]} if entry is not None and entry["etag"] else {}
+    r = get("/dashboard", token, params={"limit": limit}, headers=headers)
+    if r.status_code == 304:
+        entry["checked"] = now
+        return entry
+    if r.status_code != 200:
+        st.session_state.pop("_api_dashboard", None)
+        return None
+    entry = st.session_state["_api_dashboard"] = {"etag": r.headers.get("ETag"), "body": r.json(),
+                                                  "token": token, "limit": limit, "checked": now}
+    return entry
+
+
+def clear_dashboard():
+    st.session_state.pop("_api_dashboard", None)
+
+
+# write path -> caches it makes stale; the API's own ETag check still catches writes made
+# from other sessions, this only makes a session see its own writes immediately
+INVALIDATES = {
+    "/save": (clear_dashboard,),
+    "/submit_quiz": (clear_dashboard,),
+    "/submit_quiz/batch": (clear_dashboard,),
+    "/token": (clear_dashboard,),
+}
+
+
+def invalidate(path: str):
+    for drop in INVALIDATES.get(path, ()):
+        drop()
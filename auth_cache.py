@@ -0,0 +1,70 @@
+# auth_cache.py
+# Verified bearer token -> lightweight principal, so protected endpoints skip the users lookup.
+import threading, time
+from collections import OrderedDict
+from typing import NamedTuple
+
+
+class Principal(NamedTuple):
+    id: int
+    email: str
+
+
+class PrincipalCache:
+    """TTL-bounded LRU. An entry never outlives its token's own `exp` claim."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # token -> (principal, deadline as unix time)
+        self._by_user = {}             # user id -> {token, ...}, for invalidation
+        self._lock = threading.Lock()  # get_current_user runs on threadpool workers
+        self.hits = self.misses = self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def _drop(self, token: str):
+        principal, _ = self._entries.pop(token)
+        tokens = self._by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[principal.id]
+
+    def get(self, token: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or time.time() >= entry[1]:
+                if entry is not None:
+                    self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, principal: Principal, token_exp: float):
+        if not self.enabled:
+            return
+        deadline = min(time.time() + self.ttl, token_exp)
+        with self._lock:
+            if token in self._entries:
+                self._drop(token)
+            self._entries[token] = (principal, deadline)
+            self._by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in list(self._by_user.get(user_id, ())):
+                self._drop(token)
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "ttl_seconds": self.ttl,
+                "hits": self.hits, "misses": self.misses, "invalidations": self.invalidations}
@@ -0,0 +1,58 @@
+# badge_rules.py
+# The badge rules, evaluated from scratch over a user's saves and quiz attempts. The API applies
+# the same rules incrementally on /save and /submit_quiz; this is what the migration backfill
+# and manage.py's consistency check compare against.
+import json
+
+from quiz_stats import is_ranked
+
+BADGE_RULES = ["first_save", "top_match", "quiz_master", "quiz_fanatic", "resume_ready"]
+BADGE_NAMES = {
+    "first_save": "💾 First Save",
+    "top_match": "🌟 High Match (>=80%)",
+    "quiz_fanatic": "🔥 Quiz Fanatic (5+ quizzes taken)",
+    "resume_ready": "📄 Resume Ready (uploaded & enhanced)",
+}
+TOP_MATCH_MIN_SCORE = 80
+QUIZ_FANATIC_MIN_QUIZZES = 5
+
+
+def quiz_master_badge(career: str):
+    return f"quiz_master_{career.lower()}", f"🎓 Quiz Master ({career})"
+
+
+def is_perfect_quiz(score: int, total: int) -> bool:
+    return is_ranked(total) and score == total
+
+
+def is_resume_title(title) -> bool:
+    return "resume" in (title or "").lower()  # same as the old LIKE '%Resume%' (case-insensitive)
+
+
+def earned_badges(saves, quizzes) -> dict:
+    """{rule: (badge_id, name, earned_at)} from saves as (title, data, created_at) and quiz
+    attempts as (career, score, total, created_at), both oldest first."""
+    saves, quizzes = list(saves), list(quizzes)
+    earned = {}
+    if saves:
+        earned["first_save"] = ("first_save", BADGE_NAMES["first_save"], saves[0][2])
+    for title, data, created_at in saves:
+        try:
+            d = json.loads(data)
+            top0 = d.get("top_careers", [])[0] if d.get("top_careers") else None
+            if top0 and top0.get("match_score", 0) >= TOP_MATCH_MIN_SCORE:
+                earned["top_match"] = ("top_match", BADGE_NAMES["top_match"], created_at)
+                break
+        except Exception:
+            continue
+    for career, score, total, created_at in quizzes:
+        if is_perfect_quiz(score, total):
+            earned["quiz_master"] = (*quiz_master_badge(career), created_at)
+            break
+    if len(quizzes) >= QUIZ_FANATIC_MIN_QUIZZES:
+        earned["quiz_fanatic"] = ("quiz_fanatic", BADGE_NAMES["quiz_fanatic"], quizzes[-1][3])
+    for title, data, created_at in saves:
+        if is_resume_title(title):
+            earned["resume_ready"] = ("resume_ready", BADGE_NAMES["resume_ready"], created_at)
+            break
+    return earned
@@ -0,0 +1,327 @@
+# benchmarks/bench_api.py
+# Throughput and p50/p95/p99 latency for every API endpoint, checked against a saved baseline.
+#
+#   python benchmarks/bench_api.py                                 # in-process, over ASGI
+#   python benchmarks/bench_api.py --server                        # through a real uvicorn server
+#   python benchmarks/bench_api.py --careers 20000 --requests 500 --concurrency 32
+#   python benchmarks/bench_api.py --save-baseline /tmp/bench.json
+#   python benchmarks/bench_api.py --baseline /tmp/bench.json [--metric p95] [--threshold 0.2]
+#
+# Every input is generated into a temporary directory: a fresh SQLite database, --users
+# accounts, --distinct synthetic PDF resumes and report payloads (so the resume and report
+# caches see misses and hits), a postings file for /job_trends and a career catalog scaled up
+# to --careers from data/careers.json. Each route in the app's OpenAPI schema needs a scenario
+# below; an uncovered route, a failed request or a regression beyond --threshold exits 1.
+import argparse, asyncio, contextlib, csv, io, json, os, platform, random, sys, tempfile, time
+from typing import Callable, NamedTuple, Optional
+
+import httpx
+
+from loadtest_async_db import ADVICE, _login, _percentile, start_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+ADMIN_TOKEN = "bench-admin"
+FILLER = ["Built dashboards and reports for stakeholders.", "Worked in an agile team on a shared project.",
+          "Mentored two junior engineers.", "Presented results to leadership every quarter."]
+ANSWERS = ["I would clean the data first, then validate the model with cross validation on held out data.",
+           "Start from the business metric, choose features, and compare against a simple baseline.",
+           "Monitor the deployed model for drift and retrain when accuracy drops."]
+
+
+class Scenario(NamedTuple):
+    name: str                                # "METHOD /path", as in the OpenAPI schema
+    request: Callable                        # (ctx, i) -> (method, url, httpx request kwargs)
+    share: float = 1.0                       # fraction of --requests, for endpoints slow by design
+    concurrency: Optional[int] = None        # cap, e.g. behind the bcrypt or PDF pools' admission limits
+
+
+class Context:
+    """Generated inputs shared by the scenarios; users, quiz answers and a profile id come from prepare()."""
+
+    def __init__(self, catalog: dict, distinct: int, rng: random.Random):
+        self.careers = list(catalog["careers"])
+        self.skills = sorted({s for c in catalog["careers"].values() for s in c["required_skills"]})
+        self.queries = [", ".join(rng.sample(self.skills, 6)) for _ in range(64)]
+        self.resumes = [resume_pdf(i, self.skills, rng) for i in range(distinct)]
+        self.reports = [report_payload(i, self.careers) for i in range(distinct)]
+        self.run = int(time.time())
+        self.users = []
+        self.quiz = None
+        self.answers = {}  # career -> one answer per interview question it has
+        self.profile_id = None
+
+    def user(self, i: int) -> dict:
+        return self.users[i % len(self.users)]
+
+    def career(self, i: int) -> str:
+        return self.careers[i % len(self.careers)]
+
+
+def _pdf(i, ctx):
+    return {"files": {"file": (f"resume{i}.pdf", ctx.resumes[i % len(ctx.resumes)], "application/pdf")}}
+
+
+SCENARIOS = [
+    Scenario("POST /register", lambda ctx, i: ("POST", "/register", {"json": {"email": f"bench{ctx.run}-{i}@example.com", "password": "bench"}}), 0.2, 8),
+    Scenario("POST /token", lambda ctx, i: ("POST", "/token", {"data": {"username": f"load{i % len(ctx.users)}@example.com", "password": "load"}}), 0.2, 8),
+    Scenario("POST /advise", lambda ctx, i: ("POST", "/advise", {"json": {"user_skills": ctx.queries[i % len(ctx.queries)]}, "headers": ctx.user(i)})),
+    Scenario("POST /advise/batch", lambda ctx, i: ("POST", "/advise/batch", {"json": {"items": ctx.queries}, "headers": ctx.user(i)}), 0.2),
+    Scenario("POST /save", lambda ctx, i: ("POST", "/save", {"json": {"title": f"Bench {i}", "payload": ADVICE}, "headers": ctx.user(i)})),
+    Scenario("GET /history", lambda ctx, i: ("GET", "/history", {"params": {"limit": 20}, "headers": ctx.user(i)})),
+    Scenario("GET /dashboard", lambda ctx, i: ("GET", "/dashboard", {"headers": ctx.user(i)})),
+    Scenario("POST /upload_resume", lambda ctx, i: ("POST", "/upload_resume", {**_pdf(i, ctx), "headers": ctx.user(i)}), 0.5, 8),
+    Scenario("POST /resume_enhance", lambda ctx, i: ("POST", "/resume_enhance", _pdf(i, ctx)), 0.5, 8),
+    Scenario("POST /export_pdf", lambda ctx, i: ("POST", "/export_pdf", {"json": ctx.reports[i % len(ctx.reports)], "headers": ctx.user(i)}), 0.2, 8),
+    Scenario("GET /job_trends", lambda ctx, i: ("GET", "/job_trends", {"params": {"q": ctx.career(i % 50), "granularity": ("month", "quarter")[i % 2]}})),
+    Scenario("GET /compare_careers", lambda ctx, i: ("GET", "/compare_careers", {"params": {"c1": ctx.career(i), "c2": ctx.career(i + 1)}})),
+    Scenario("GET /similar_careers", lambda ctx, i: ("GET", "/similar_careers", {"params": {"career": ctx.career(i)} if i % 2 else {"skills": ctx.queries[i % len(ctx.queries)]}})),
+    Scenario("GET /quiz_questions", lambda ctx, i: ("GET", "/quiz_questions", {"params": {"career": "Python", "limit": 2}})),
+    Scenario("POST /submit_quiz", lambda ctx, i: ("POST", "/submit_quiz", {"json": ctx.quiz, "headers": ctx.user(i)})),
+    Scenario("POST /submit_quiz/batch", lambda ctx, i: ("POST", "/submit_quiz/batch", {"json": {"submissions": [ctx.quiz] * 10}, "headers": ctx.user(i)}), 0.5),
+    Scenario("GET /quiz_scores", lambda ctx, i: ("GET", "/quiz_scores", {"params": {"limit": 20}, "headers": ctx.user(i)})),
+    Scenario("GET /quiz_leaderboard", lambda ctx, i: ("GET", "/quiz_leaderboard", {"params": {"career": "Python"}, "headers": ctx.user(i)})),
+    Scenario("GET /badges", lambda ctx, i: ("GET", "/badges", {"headers": ctx.user(i)})),
+    Scenario("GET /interview_questions", lambda ctx, i: ("GET", "/interview_questions", {"params": {"career": ctx.career(i % 4)}})),
+    Scenario("POST /interview_feedback", lambda ctx, i: ("POST", "/interview_feedback", {"params": {"career": ctx.career(i % 4)}, "json": {"answers": ctx.answers[ctx.career(i % 4)]}})),
+    Scenario("GET /stats", lambda ctx, i: ("GET", "/stats", {})),
+    Scenario("GET /metrics", lambda ctx, i: ("GET", "/metrics", {})),
+    Scenario("GET /admin/profiles", lambda ctx, i: ("GET", "/admin/profiles", {"headers": {"X-Admin-Token": ADMIN_TOKEN}})),
+    Scenario("GET /admin/profiles/{profile_id}", lambda ctx, i: ("GET", f"/admin/profiles/{ctx.profile_id}", {"params": {"format": ("collapsed", "pstats")[i % 2]}, "headers": {"X-Admin-Token": ADMIN_TOKEN}})),
+    Scenario("POST /admin/reload_catalog", lambda ctx, i: ("POST", "/admin/reload_catalog", {"headers": {"X-Admin-Token": ADMIN_TOKEN}}), 0.02, 1),
+]
+
+
+# --- generated inputs ---
+
+def scaled_catalog(n: int, rng: random.Random) -> dict:
+    # the bundled careers keep their names; the rest are variants mixing half of a bundled
+    # career's skills with a shared pool of synthetic ones, so skills overlap across careers
+    with open(os.path.join(ROOT, "data", "careers.json"), encoding="utf-8") as f:
+        data = json.load(f)
+    careers = dict(data["careers"])
+    templates = list(careers.values())
+    pool = [f"Skill {i}" for i in range(max(50, n // 4))]
+    while len(careers) < n:
+        i = len(careers)
+        t = templates[i % len(templates)]
+        skills = rng.sample(t["required_skills"], max(1, len(t["required_skills"]) // 2)) + rng.sample(pool, 5)
+        careers[f"Career {i}"] = {"required_skills": skills, "roadmap": t["roadmap"]}
+    return {"careers": careers, "skill_aliases": data.get("skill_aliases", {})}
+
+
+def write_postings(path: str, n: int, catalog: dict, rng: random.Random):
+    names = list(catalog["careers"])[:200]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["posted_at", "career", "skills"])
+        for _ in range(n):
+            career = rng.choice(names)
+            skills = catalog["careers"][career]["required_skills"]
+            w.writerow([f"{rng.randint(2022, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", career,
+                        "; ".join(rng.sample(skills, min(3, len(skills))))])
+
+
+def resume_pdf(i: int, skills: list, rng: random.Random) -> bytes:
+    from reportlab.pdfgen import canvas
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    y = 800
+    for line in [f"Candidate {i}", f"candidate{i}@example.com", "Skills: " + ", ".join(rng.sample(skills, 8))] + rng.sample(FILLER, 3):
+        c.drawString(40, y, line)
+        y -= 16
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def report_payload(i: int, careers: list) -> dict:
+    return {"top_careers": [{**ADVICE["top_careers"][0], "career": careers[(i + k) % len(careers)]} for k in range(3)],
+            "tips": f"Report {i}: focus on missing skills."}
+
+
+# --- running ---
+
+@contextlib.asynccontextmanager
+async def in_process_client(env: dict, concurrency: int):
+    os.environ.update(env)
+    import api  # reads its configuration from the environment at import
+    async with api.app.router.lifespan_context(api.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench", timeout=120) as client:
+            yield client
+
+
+@contextlib.asynccontextmanager
+async def server_client(env: dict, concurrency: int):
+    proc, url = start_server(ROOT, env)
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+            yield client
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+async def prepare(client, ctx: Context, users: int):
+    sem = asyncio.Semaphore(8)  # logins go through the bcrypt pool; don't trip its admission limit
+
+    async def login(i):
+        async with sem:
+            return await _login(client, i)
+    ctx.users = await asyncio.gather(*(login(i) for i in range(users)))
+    r = await client.get("/quiz_questions", params={"career": "Python", "limit": 2})
+    r.raise_for_status()
+    ctx.quiz = {"career": "Python", "quiz_token": r.json()["quiz_token"],
+                "answers": {str(q["id"]): q["options"][0] for q in r.json()["questions"]}}
+    for career in ctx.careers[:4]:
+        r = await client.get("/interview_questions", params={"career": career})
+        r.raise_for_status()
+        ctx.answers[career] = [ANSWERS[k % len(ANSWERS)] for k in range(len(r.json()["questions"]))]
+    r = await client.get("/stats", headers={"X-Profile": "1", "X-Admin-Token": ADMIN_TOKEN})
+    r.raise_for_status()
+    ctx.profile_id = r.headers["x-profile-id"]
+
+
+async def uncovered_routes(client) -> list:
+    r = await client.get("/openapi.json")
+    r.raise_for_status()
+    routes = {f"{method.upper()} {path}" for path, ops in r.json()["paths"].items() for method in ops}
+    return sorted(routes - {s.name for s in SCENARIOS})
+
+
+async def run_scenario(client, ctx: Context, sc: Scenario, n: int, concurrency: int, first: int = 0) -> dict:
+    latencies, errors = [], []
+    indices = iter(range(first, first + n))  # shared by the workers; each takes the next request
+
+    async def worker():
+        for i in indices:
+            method, url, kwargs = sc.request(ctx, i)
+            start = time.perf_counter()
+            try:
+                r = await client.request(method, url, **kwargs)
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors.append(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(n, concurrency, sc.concurrency or concurrency)))))
+    elapsed = time.perf_counter() - start
+    return {"n": n, "errors": len(errors), "rps": round(n / elapsed, 1),
+            **{f"p{p}": round(_percentile(latencies, p), 2) for p in (50, 95, 99)}}
+
+
+async def run_suite(args, env: dict, ctx: Context) -> dict:
+    opener = server_client if args.server else in_process_client
+    scenarios = [s for s in SCENARIOS if not args.only or any(o in s.name for o in args.only)]
+    async with opener(env, args.concurrency) as client:
+        uncovered = await uncovered_routes(client)
+        await prepare(client, ctx, args.users)
+        endpoints = {}
+        for sc in scenarios:
+            n = max(1, round(args.requests * sc.share))
+            if args.warmup:
+                await run_scenario(client, ctx, sc, args.warmup, args.concurrency, first=n)
+            endpoints[sc.name] = await run_scenario(client, ctx, sc, n, args.concurrency)
+            print(f"  {sc.name}: {endpoints[sc.name]['rps']} req/s", file=sys.stderr)
+    return {"meta": {"mode": "server" if args.server else "in-process", "careers": args.careers, "users": args.users,
+                     "requests": args.requests, "concurrency": args.concurrency, "python": platform.python_version(),
+                     "at": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "uncovered": uncovered, "endpoints": endpoints}
+
+
+# --- reporting ---
+
+def regressions(current: dict, baseline: dict, metric: str, threshold: float, min_ms: float) -> dict:
+    # endpoints whose latency metric grew by more than threshold (and by at least min_ms)
+    out = {}
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if base and cur[metric] > base[metric] * (1 + threshold) and cur[metric] - base[metric] >= min_ms:
+            out[name] = cur[metric] / base[metric] - 1 if base[metric] else float("inf")
+    return out
+
+
+def print_report(report: dict, baseline: dict = None, metric: str = "p95"):
+    meta = report["meta"]
+    print(f"\n{meta['mode']}: {meta['careers']} careers, {meta['users']} users, concurrency {meta['concurrency']}")
+    print(f"{'endpoint':<34}{'n':>6}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          + (f"{'vs base':>10}" if baseline else ""))
+    for name, r in report["endpoints"].items():
+        line = f"{name:<34}{r['n']:>6}{r['errors']:>8}{r['rps']:>10}{r['p50']:>10}{r['p95']:>10}{r['p99']:>10}"
+        base = (baseline or {}).get(name)
+        if base and base[metric]:
+            line += f"{r[metric] / base[metric] - 1:>+10.0%}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--server", action="store_true", help="go through a uvicorn server instead of in-process ASGI")
+    parser.add_argument("--requests", type=int, default=200, help="per endpoint, scaled down for slow ones")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=5, help="unrecorded requests per endpoint first")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--careers", type=int, default=2000)
+    parser.add_argument("--postings", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=20, help="distinct resumes and report payloads")
+    parser.add_argument("--only", nargs="*", help="run only endpoints whose name contains one of these")
+    parser.add_argument("--save-baseline", metavar="FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="fail on regressions against this saved run")
+    parser.add_argument("--metric", default="p95", choices=["p50", "p95", "p99"])
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative growth of --metric")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore regressions smaller than this")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    tmp = tempfile.mkdtemp(prefix="bench_api_")
+    catalog = scaled_catalog(args.careers, rng)
+    catalog_path = os.path.join(tmp, "careers.json")
+    with open(catalog_path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f)
+    postings_path = os.path.join(tmp, "job_postings.csv")
+    write_postings(postings_path, args.postings, catalog, rng)
+    ctx = Context(catalog, args.distinct, rng)
+    env = {"CAREER_CATALOG_PATH": catalog_path, "JOB_POSTINGS_PATH": postings_path, "ADMIN_TOKEN": ADMIN_TOKEN,
+           "CATALOG_POLL_SECONDS": "0", "BCRYPT_ROUNDS": "4", "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+           "PROFILE_DIR": os.path.join(tmp, "profiles")}
+    if args.server:
+        env.pop("DATABASE_URL")  # start_server gives each server its own database
+
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    report = asyncio.run(run_suite(args, env, ctx))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            saved = json.load(f)
+        baseline = saved["endpoints"]
+        differs = {k: (saved["meta"].get(k), v) for k, v in report["meta"].items()
+                   if k in ("mode", "careers", "users", "requests", "concurrency") and saved["meta"].get(k) != v}
+        if differs:
+            print(f"warning: baseline was run with different settings (baseline, current): {differs}")
+    print_report(report, baseline, args.metric)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if report["uncovered"] and not args.only:
+        print(f"\nroutes without a scenario: {', '.join(report['uncovered'])}")
+        failed = True
+    broken = [name for name, r in report["endpoints"].items() if r["errors"]]
+    if broken:
+        print(f"\nendpoints with failed requests: {', '.join(broken)}")
+        failed = True
+    if baseline:
+        worse = regressions(report["endpoints"], baseline, args.metric, args.threshold, args.min_ms)
+        for name, growth in worse.items():
+            print(f"regression: {name} {args.metric} {growth:+.0%} (threshold {args.threshold:+.0%})")
+        failed = failed or bool(worse)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_auth_cache.py
+# SQL queries and latency per protected request, with and without the principal cache.
+#
+#   python benchmarks/bench_auth_cache.py [--requests 500]
+#
+# Runs in-process against api.app with a throwaway SQLite database.
+import argparse, os, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_auth_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    import api
+
+    queries = [0]
+
+    def _count(*_):
+        queries[0] += 1
+
+    # the protected endpoints and get_current_user run on the async engine; count both
+    for engine in (api.engine, api.async_engine.sync_engine):
+        event.listen(engine, "before_cursor_execute", _count)
+
+    with TestClient(api.app) as client:
+        client.post("/register", json={"email": "bench@example.com", "password": "bench"})
+        token = client.post("/token", data={"username": "bench@example.com", "password": "bench"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"{'mode':<10}{'endpoint':<12}{'queries/req':>12}{'ms/req':>10}")
+        for mode, ttl in (("no cache", 0), ("cached", 60)):
+            api.principal_cache.ttl = ttl
+            for path in ("/history", "/badges", "/quiz_scores"):
+                client.get(path, headers=headers)  # warm up (and fill the cache when enabled)
+                queries[0] = 0
+                start = time.perf_counter()
+                for _ in range(args.requests):
+                    client.get(path, headers=headers)
+                elapsed = time.perf_counter() - start
+                print(f"{mode:<10}{path:<12}{queries[0] / args.requests:>12.2f}{elapsed / args.requests * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_interview_scoring.py
+# Throughput of interview answer scoring for one batch of answers.
+#
+#   python benchmarks/bench_interview_scoring.py [--answers 1000] [--repeat 20]
+#
+# Answers are synthetic: words drawn from each question's reference concepts mixed with
+# filler, so similarities spread over the whole range. Runs on the bundled interview bank.
+import argparse, json, os, random, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from interview_scoring import InterviewScorer
+
+FILLER = "honestly I think that in my previous job we usually tried to look at this carefully".split()
+
+
+def synthetic_answers(bank: dict, n: int, rng: random.Random):
+    questions = [(q["question"], " ".join(q["concepts"].values()).split()) for qs in bank.values() for q in qs]
+    qids, answers = [], []
+    for _ in range(n):
+        qid = rng.randrange(len(questions))
+        words = rng.sample(questions[qid][1], min(12, len(questions[qid][1]))) + rng.sample(FILLER, 8)
+        rng.shuffle(words)
+        qids.append(qid)
+        answers.append(" ".join(words))
+    return qids, answers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--bank", default=os.path.join(ROOT, "data", "interview_bank.json"))
+    args = parser.parse_args()
+
+    with open(args.bank, encoding="utf-8") as f:
+        bank = json.load(f)
+    start = time.perf_counter()
+    scorer = InterviewScorer(bank)
+    build_ms = (time.perf_counter() - start) * 1000
+    qids, answers = synthetic_answers(bank, args.answers, random.Random(0))
+
+    scorer.score_batch(qids, answers)  # warm up
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        results = scorer.score_batch(qids, answers)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    median = timings[len(timings) // 2]
+    print(f"bank: {len(scorer.question_text)} questions, {len(scorer.concept_names)} concepts, "
+          f"{len(scorer.vocab)} terms (built in {build_ms:.1f} ms)")
+    print(f"batch of {len(answers)}: median {median * 1000:.1f} ms, best {timings[0] * 1000:.1f} ms, "
+          f"{len(answers) / median:,.0f} answers/s")
+    print(f"mean score {sum(r['score'] for r in results) / len(results):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_json.py
+# Serialization cost per response body, the way the API used to encode it against the way it does now.
+#
+#   python benchmarks/bench_json.py [--careers 5000] [--rows 100] [--repeat 50]
+#
+# before: FastAPI's default path, jsonable_encoder walking the result and stdlib json.dumps
+#         (/history also decoded every stored blob first).
+# after:  fast_json (orjson when installed), stored JSON and per-career details spliced in as
+#         bytes, and /dashboard validated and dumped by its compiled pydantic response model.
+# Encoding only: no database, no HTTP. The catalog is scaled up like bench_api.py's.
+import argparse, json, os, random, sys, tempfile, time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_api import scaled_catalog
+
+
+def stdlib_response(content) -> bytes:
+    # what starlette's JSONResponse.render did with the result of jsonable_encoder
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def best_median(fn, repeat: int):
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], timings[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--careers", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=100, help="saved results per /history and /dashboard page")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='bench_json_')}/bench.db")
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    import api, fast_json
+    from career_catalog import CatalogSnapshot
+
+    rng = random.Random(0)
+    data = scaled_catalog(args.careers, rng)
+    catalog = CatalogSnapshot(data["careers"], data["skill_aliases"])
+    names = list(catalog.careers)
+    user_ids = catalog.matcher.parse("Python, SQL, Machine Learning, Statistics, Docker")
+    top = [catalog.matcher.result(idx, user_ids) for idx in catalog.matcher.rank(user_ids)]
+    tips = "Focus on missing skills, build 2 projects, and network."
+
+    now = datetime(2025, 1, 1)
+    rows = [(i, f"Saved result {i}", json.dumps({"top_careers": top[:5], "personalized_tips": tips}),
+             now - timedelta(minutes=i)) for i in range(args.rows)]
+    dashboard = {
+        "history": [{"id": i, "title": title, "kind": "advice", "top_career": top[0]["career"],
+                     "top_score": top[0]["match_score"], "created_at": created.isoformat()}
+                    for i, title, _, created in rows],
+        "history_next_cursor": "MjAyNS0wMS0wMVQwMDowMDowMHwx",
+        "badges": [{"id": f"badge_{i}", "name": f"Badge {i}", "earned_at": now.isoformat()} for i in range(10)],
+        "scores": [{"career": names[i % len(names)], "score": i % 10, "total": 10, "created_at": now.isoformat()}
+                   for i in range(args.rows)],
+        "scores_next_cursor": None,
+    }
+    dashboard_model = TypeAdapter(api.Dashboard)
+    pair = (names[0], names[len(names) // 2])
+    stamp = now.isoformat()  # /advise's timestamp, fixed so both encodings can be compared
+
+    def details(name):
+        career = catalog.careers[name]
+        return {"name": name, "required_skills": career.required_skills, "roadmap": career.roadmap}
+
+    cases = [
+        (f"/advise ({len(top)} careers)",
+         lambda: stdlib_response(jsonable_encoder({"top_careers": top, "personalized_tips": tips,
+                                                   "timestamp": stamp})),
+         lambda: b'{"top_careers":' + fast_json.dumps(top) + b',"personalized_tips":' + fast_json.dumps(tips)
+         + b',"timestamp":' + fast_json.dumps(stamp) + b"}"),
+        (f"/history full ({args.rows} rows)",
+         lambda: stdlib_response(jsonable_encoder({
+             "history": [{"id": i, "title": title, "data": json.loads(blob), "created_at": created.isoformat()}
+                         for i, title, blob, created in rows], "next_cursor": None})),
+         lambda: b"".join(api._history_parts(rows, None))),
+        (f"/dashboard ({args.rows}+{args.rows} rows)",
+         lambda: stdlib_response(jsonable_encoder(dashboard)),
+         lambda: fast_json.dumps(dashboard_model.dump_python(dashboard_model.validate_python(dashboard), mode="json"))),
+        ("/compare_careers",
+         lambda: stdlib_response(jsonable_encoder({
+             "career1": details(pair[0]), "career2": details(pair[1]),
+             "salary_estimates": {pair[0]: "₹12 LPA", pair[1]: "₹10 LPA"}})),
+         lambda: b'{"career1":' + api.career_json(catalog, pair[0]) + b',"career2":' + api.career_json(catalog, pair[1])
+         + b',"salary_estimates":' + fast_json.dumps({pair[0]: "₹12 LPA", pair[1]: "₹10 LPA"}) + b"}"),
+    ]
+
+    print(f"encoder: {'orjson' if fast_json.orjson is not None else 'stdlib json (orjson not installed)'}")
+    print(f"{'payload':<30}{'bytes':>10}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, before, after in cases:
+        if json.loads(before()) != json.loads(after()):
+            sys.exit(f"{name}: before and after encode different documents")
+        before_ms = best_median(before, args.repeat)[0] * 1000
+        after_ms = best_median(after, args.repeat)[0] * 1000
+        print(f"{name:<30}{len(after()):>10,}{before_ms:>12.3f}{after_ms:>12.3f}{before_ms / after_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# benchmarks/loadtest_async_db.py
+# Latency of the DB-backed endpoints under many concurrent clients, against a real uvicorn server.
+#
+#   python benchmarks/loadtest_async_db.py [--clients 500] [--rounds 4]
+#   python benchmarks/loadtest_async_db.py --baseline-dir /tmp/baseline   # compare with another checkout
+#
+# Each server gets a throwaway SQLite database and BCRYPT_ROUNDS=4 so setup is quick, and a
+# keep-alive timeout longer than a client sits idle under load, so a reused connection is never
+# closed by the server mid-request (that shows up as "Server disconnected", not as latency).
+# To compare with the sync handlers: git worktree add /tmp/baseline <older commit>
+import argparse, asyncio, json, os, socket, subprocess, sys, tempfile, time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADVICE = {"top_careers": [{"career": "Data Scientist", "match_score": 80.0, "matched_skills": ["Python"],
+                           "missing_skills": ["Sql"], "roadmap": ["Python basics"]}]}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app_dir: str, env: dict = None):
+    port = _free_port()
+    tmp = tempfile.mkdtemp(prefix="loadtest_")
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp}/load.db", "BCRYPT_ROUNDS": "4", **(env or {})}
+    env.pop("ASYNC_DATABASE_URL", None)
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--log-level", "warning",
+                             "--timeout-keep-alive", "120"],
+                            cwd=app_dir, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(url + "/docs", timeout=1)
+            return proc, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"server in {app_dir} did not start")
+
+
+async def _login(client, i: int) -> dict:
+    email, password = f"load{i}@example.com", "load"
+    await client.post("/register", json={"email": email, "password": password})
+    r = await client.post("/token", data={"username": email, "password": password})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def _client_loop(client, headers, quiz, rounds, samples, errors):
+    calls = (
+        ("POST /save", lambda: client.post("/save", json={"title": "Load test", "payload": ADVICE}, headers=headers)),
+        ("GET /history", lambda: client.get("/history", params={"limit": 20}, headers=headers)),
+        ("POST /submit_quiz", lambda: client.post("/submit_quiz", json=quiz, headers=headers)),
+        ("GET /quiz_scores", lambda: client.get("/quiz_scores", params={"limit": 20}, headers=headers)),
+        ("GET /badges", lambda: client.get("/badges", headers=headers)),
+    )
+    for _ in range(rounds):
+        for name, call in calls:
+            start = time.perf_counter()
+            try:
+                r = await call()
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors[name] = errors.get(name, 0) + 1
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))] if values else 0.0
+
+
+async def run_load(url: str, clients: int, users: int, rounds: int):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        sem = asyncio.Semaphore(8)  # logins go through the bcrypt pool; don't trip its admission limit
+
+        async def login(i):
+            async with sem:
+                return await _login(client, i)
+        tokens = await asyncio.gather(*(login(i) for i in range(users)))
+        r = await client.get("/quiz_questions", params={"career": "Python", "limit": 2})
+        r.raise_for_status()
+        served = r.json()
+        quiz = {"career": "Python", "quiz_token": served["quiz_token"],
+                "answers": {str(q["id"]): q["options"][0] for q in served["questions"]}}
+        samples, errors = {}, {}
+        start = time.perf_counter()
+        await asyncio.gather(*(_client_loop(client, tokens[i % users], quiz, rounds, samples, errors) for i in range(clients)))
+        elapsed = time.perf_counter() - start
+    everything = [v for vs in samples.values() for v in vs]
+    report = {"clients": clients, "requests": len(everything), "seconds": round(elapsed, 2),
+              "rps": round(len(everything) / elapsed, 1), "endpoints": {}}
+    for name, vs in list(samples.items()) + [("all", everything)]:
+        report["endpoints"][name] = {"n": len(vs), "errors": errors.get(name, 0) if name != "all" else sum(errors.values()),
+                                     **{f"p{p}": round(_percentile(vs, p), 1) for p in (50, 95, 99)}}
+    return report
+
+
+def print_report(label: str, report: dict):
+    print(f"\n{label}: {report['requests']} requests from {report['clients']} clients in {report['seconds']}s ({report['rps']} req/s)")
+    print(f"{'endpoint':<20}{'n':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in report["endpoints"].items():
+        print(f"{name:<20}{r['n']:>7}{r['errors']:>8}{r['p50']:>10}{r['p95']:>10}{r['p99']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--users", type=int, default=50, help="distinct accounts shared by the clients")
+    parser.add_argument("--rounds", type=int, default=4, help="passes over the endpoint mix per client")
+    parser.add_argument("--url", help="load an already running server instead of starting this checkout")
+    parser.add_argument("--baseline-dir", help="also start and load the api.py in this directory")
+    parser.add_argument("--baseline-url", help="also load this already running server")
+    parser.add_argument("--out", help="write the reports as JSON")
+    args = parser.parse_args()
+
+    targets = [("current", args.url, ROOT)]
+    if args.baseline_url or args.baseline_dir:
+        targets.append(("baseline", args.baseline_url, args.baseline_dir))
+    results = {}
+    for label, url, app_dir in targets:
+        proc = None
+        if url is None:
+            proc, url = start_server(app_dir)
+        try:
+            results[label] = asyncio.run(run_load(url, args.clients, args.users, args.rounds))
+        finally:
+            if proc is not None:
+                proc.terminate(); proc.wait()
+        print_report(label, results[label])
+
+    if "baseline" in results:
+        cur, base = results["current"]["endpoints"]["all"], results["baseline"]["endpoints"]["all"]
+        print(f"\np99 (all endpoints): current {cur['p99']} ms, baseline {base['p99']} ms")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# career_catalog.py
+# The career catalog, loaded from a data file into an immutable snapshot, and the holder
+# that swaps in a new snapshot when the file changes. Readers take `holder.current` once and
+# use that snapshot for the whole request, so a reload never changes data under them.
+import csv, json, os, sys, threading, time
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+import fast_json
+from career_similarity import CareerSimilarity
+from skill_matcher import SkillMatcher, build_skill_extractor
+
+LIST_SEPARATOR = ";"  # required_skills / roadmap cells in CSV catalogs
+
+
+class CatalogError(ValueError):
+    """The catalog file is missing, unreadable or malformed; the previous snapshot stays live."""
+
+
+class Career(NamedTuple):
+    name: str
+    required_skills: tuple
+    roadmap: tuple
+
+
+def _strings(value, field: str, career: str) -> tuple:
+    if isinstance(value, str):
+        value = value.split(LIST_SEPARATOR)
+    if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise CatalogError(f"{career}: {field} must be a list of strings")
+    # interned: the same skill named by many careers is one string object
+    return tuple(sys.intern(v.strip()) for v in value if v.strip())
+
+
+def _career(name: str, details) -> Career:
+    if not isinstance(details, dict):
+        raise CatalogError(f"{name}: expected an object with required_skills and roadmap")
+    skills = _strings(details.get("required_skills", ()), "required_skills", name)
+    roadmap = _strings(details.get("roadmap", ()), "roadmap", name)
+    return Career(sys.intern(name.strip()), skills, roadmap)
+
+
+def read_catalog(path: str):
+    # JSON: {"careers": {name: {"required_skills": [...], "roadmap": [...]}}, "skill_aliases": {...}}
+    #       (a bare {name: {...}} mapping is read as careers without aliases)
+    # CSV:  career,required_skills,roadmap with ";"-separated lists; no aliases
+    try:
+        if path.lower().endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                careers, aliases = {row["career"]: row for row in csv.DictReader(f) if row.get("career")}, {}
+        else:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise CatalogError(f"{path}: expected a JSON object")
+            careers, aliases = (data["careers"], data.get("skill_aliases") or {}) if "careers" in data else (data, {})
+    except (OSError, ValueError, KeyError) as e:
+        if isinstance(e, CatalogError):
+            raise
+        raise CatalogError(f"{path}: {e}") from e
+    if not isinstance(careers, dict) or not isinstance(aliases, dict):
+        raise CatalogError(f"{path}: careers and skill_aliases must be objects")
+    if not careers:
+        raise CatalogError(f"{path}: no careers")
+    return careers, {k: _strings(v, "alias list", k) for k, v in aliases.items()}
+
+
+class CatalogSnapshot:
+    """One loaded catalog and everything derived from it; never mutated after construction."""
+
+    def __init__(self, careers: dict, aliases: dict = None, source: str = None, stamp=None):
+        entries = {}
+        for name, details in careers.items():
+            career = _career(name, details)
+            entries[career.name] = career
+        self.careers = MappingProxyType(entries)
+        self.aliases = MappingProxyType(dict(aliases or {}))
+        views = {c.name: {"required_skills": c.required_skills, "roadmap": c.roadmap} for c in entries.values()}
+        self.matcher = SkillMatcher(views)
+        self.extractor = build_skill_extractor(views, self.aliases)
+        self.similarity = CareerSimilarity(self.matcher)
+        # each career's details, encoded once per snapshot: {"required_skills": [...], "roadmap": [...]}
+        self.details_json = {name: fast_json.dumps(view) for name, view in views.items()}
+        self.index = {name: i for i, name in enumerate(self.matcher.careers)}
+        self.source = source
+        self.stamp = stamp  # (mtime_ns, size) of the file it was read from
+        self.loaded_at = time.time()
+
+    @classmethod
+    def load(cls, path: str) -> "CatalogSnapshot":
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            raise CatalogError(f"{path}: {e}") from e
+        careers, aliases = read_catalog(path)
+        return cls(careers, aliases, source=path, stamp=(st.st_mtime_ns, st.st_size))
+
+    def get(self, name: str) -> Optional[Career]:
+        return self.careers.get(name)
+
+
+class CatalogHolder:
+    """The live snapshot for one process. Reloads build the new snapshot first, then swap the reference."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.current = CatalogSnapshot.load(path)
+        self._lock = threading.Lock()  # one reload at a time; readers never take it
+        self.reloads = self.failures = 0
+        self.last_error = None
+
+    def reload(self) -> CatalogSnapshot:
+        with self._lock:
+            try:
+                snapshot = CatalogSnapshot.load(self.path)
+            except CatalogError as e:
+                self.failures += 1
+                self.last_error = str(e)
+                raise
+            self.current = snapshot
+            self.reloads += 1
+            self.last_error = None
+            return snapshot
+
+    def changed(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False  # mid-replace or deleted: keep serving what we have
+        return (st.st_mtime_ns, st.st_size) != self.current.stamp
+
+    def reload_if_changed(self) -> bool:
+        if not self.changed():
+            return False
+        try:
+            self.reload()
+        except CatalogError:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        snap = self.current
+        return {"source": snap.source, "careers": len(snap.careers), "skills": len(snap.matcher.skill_ids),
+                "similarity": snap.similarity.stats(), "loaded_at": snap.loaded_at, "reloads": self.reloads,
+                "failures": self.failures, "last_error": self.last_error}
@@ -0,0 +1,74 @@
+# career_similarity.py
+# Careers as vectors in skill space, for "careers like this one" and "careers for these
+# skills". Built once per catalog snapshot. Each career is its IDF-weighted, unit-length
+# required-skill vector, kept sparse and exact: a query is scored against the careers that
+# share a skill with it by walking the matcher's skill postings (the same inverted index
+# /advise ranks with), so a nonzero similarity always means at least one shared skill and
+# careers sharing nothing never show up. Small catalogs also keep the full pairwise matrix,
+# built the same way, so "careers like this one" is one row read.
+import numpy as np
+
+MATRIX_MAX_CAREERS = 2048   # n x n float32 matrix up to here (16 MB); postings walk above
+
+
+def _top_k(ids: np.ndarray, sims: np.ndarray, k: int) -> list:
+    # best k by similarity, ties by catalog order
+    if len(ids) > k:
+        part = np.argpartition(-sims, k - 1)[:k]
+        ids, sims = ids[part], sims[part]
+    order = np.lexsort((ids, -sims))
+    return [(int(ids[i]), float(sims[i])) for i in order]
+
+
+class CareerSimilarity:
+    """Exact cosine similarity between IDF-weighted skill vectors of the careers in a SkillMatcher."""
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        n, v = len(matcher.careers), len(matcher.skill_ids)
+        df = np.zeros(v)
+        for sid, idxs in matcher.postings.items():
+            df[sid] = len(idxs)
+        self.idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        norms = np.array([np.linalg.norm(self.idf[[sid for _, sid in names]]) for names in matcher.skill_names],
+                         dtype=np.float32)
+        # skill id -> (careers that require it, that skill's weight in each one's unit vector)
+        self.postings = {sid: (np.asarray(idxs), self.idf[sid] / norms[idxs]) for sid, idxs in matcher.postings.items()}
+        self.n = n
+        self.matrix = None
+        if n <= MATRIX_MAX_CAREERS:
+            self.matrix = np.zeros((n, n), dtype=np.float32)
+            for idx, names in enumerate(matcher.skill_names):
+                self.matrix[idx] = self.scores(self.weights(sid for _, sid in names))
+
+    def weights(self, skill_ids) -> dict:
+        # a query's unit vector: skill id -> weight
+        ids = sorted(set(skill_ids))
+        norm = float(np.linalg.norm(self.idf[ids])) if ids else 0.0
+        return {sid: float(self.idf[sid]) / norm for sid in ids} if norm > 0 else {}
+
+    def scores(self, weights: dict) -> np.ndarray:
+        # cosine with every career; exactly 0 for careers sharing no skill with the query
+        sims = np.zeros(self.n, dtype=np.float32)
+        for sid, w in weights.items():
+            idxs, career_w = self.postings[sid]
+            sims[idxs] += w * career_w  # a posting lists each career once
+        return sims
+
+    def _nearest(self, sims: np.ndarray, k: int, exclude: int = None) -> list:
+        # [(career idx, cosine similarity)], best first
+        if exclude is not None:
+            sims[exclude] = 0
+        ids = np.flatnonzero(sims)
+        return _top_k(ids, sims[ids], k)
+
+    def similar_to_career(self, idx: int, k: int) -> list:
+        if self.matrix is not None:
+            return self._nearest(self.matrix[idx].copy(), k, exclude=idx)
+        return self._nearest(self.scores(self.weights(sid for _, sid in self.matcher.skill_names[idx])), k, exclude=idx)
+
+    def similar_to_skills(self, skill_ids, k: int) -> list:
+        return self._nearest(self.scores(self.weights(skill_ids)), k)
+
+    def stats(self) -> dict:
+        return {"careers": self.n, "skills": len(self.idf), "mode": "matrix" if self.matrix is not None else "postings"}
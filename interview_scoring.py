@@ -0,0 +1,126 @@
+# interview_scoring.py
+# Scores mock-interview answers against reference concepts with TF-IDF vectors. Every
+# concept of every question is vectorized once when the bank is loaded; a batch of answers
+# becomes one dense matrix and is scored with a single matrix product.
+import re
+from functools import lru_cache
+
+import numpy as np
+
+MATCH_SIMILARITY = 0.15   # a concept counts as covered from here
+FULL_SIMILARITY = 0.5     # ... and as fully covered from here
+CLOSEST_CONCEPTS = 3
+DEFAULT_CAREER = "default"
+
+STOPWORDS = frozenset("""a an and are as at be by can do does for from has have how i if in into is it its
+it's of on or so such than that the their then there these this to was what when where which while who
+why will with would you your""".split())
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ness", "ies", "ied", "ed", "es", "ly", "s")
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    # crude suffix stripping, so "training"/"trained"/"trains" all meet at "train"
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text: str) -> list:
+    return [stem(w) for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+class InterviewScorer:
+    """Precomputed concept vectors for every question in an interview bank.
+
+    bank: {career: [{"question": str, "concepts": {name: reference text}}, ...]}, with an
+    optional "default" career used for careers that have no questions of their own.
+    """
+
+    def __init__(self, bank: dict):
+        self.questions = {}     # career -> [global question index, ...]
+        self.question_text = []
+        self.concept_names = []
+        concept_question = []   # concept row -> global question index
+        docs = []
+        for career, questions in bank.items():
+            for q in questions:
+                gi = len(self.question_text)
+                self.questions.setdefault(career, []).append(gi)
+                self.question_text.append(q["question"])
+                for name, text in q["concepts"].items():
+                    self.concept_names.append(name)
+                    concept_question.append(gi)
+                    docs.append(terms(f"{name} {text}"))
+
+        self.vocab = {}
+        for doc in docs:
+            for t in doc:
+                self.vocab.setdefault(t, len(self.vocab))
+        df = np.zeros(len(self.vocab))
+        for doc in docs:
+            df[[self.vocab[t] for t in set(doc)]] += 1
+        self.idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+
+        self.concepts = self._vectorize(docs)                          # (concepts, vocab), unit rows
+        self.concept_question = np.array(concept_question, dtype=np.int64)
+        self.concept_counts = np.bincount(self.concept_question, minlength=len(self.question_text))
+        # reference answer per question: all of its concepts together
+        refs = np.zeros((len(self.question_text), len(self.vocab)), dtype=np.float32)
+        np.add.at(refs, self.concept_question, self.concepts)
+        self.references = _unit_rows(refs)
+
+    def _vectorize(self, docs) -> np.ndarray:
+        # sublinear tf x idf, L2-normalized; terms outside the vocabulary can't match anything
+        vocab = self.vocab
+        rows, cols = [], []
+        for i, doc in enumerate(docs):
+            ids = [vocab[t] for t in doc if t in vocab]
+            rows.extend([i] * len(ids))
+            cols.extend(ids)
+        m = np.zeros((len(docs), len(vocab)), dtype=np.float32)
+        np.add.at(m, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), 1)
+        present = m > 0
+        m[present] = 1 + np.log(m[present])
+        m *= self.idf
+        return _unit_rows(m)
+
+    def career_questions(self, career: str) -> list:
+        return self.questions.get(career) or self.questions.get(DEFAULT_CAREER, [])
+
+    def score_batch(self, question_ids, answers) -> list:
+        # question_ids[i] is the global index of the question answers[i] responds to
+        qidx = np.asarray(question_ids, dtype=np.int64)
+        if not len(qidx):
+            return []
+        vecs = self._vectorize([terms(a) for a in answers])
+        similarity = np.einsum("ij,ij->i", vecs, self.references[qidx])
+        sims = vecs @ self.concepts.T                                   # (answers, all concepts)
+        own = self.concept_question[None, :] == qidx[:, None]           # concepts of each answer's question
+        sims = np.where(own, sims, -1.0)
+        coverage = np.clip(sims / FULL_SIMILARITY, 0, 1).sum(axis=1) / self.concept_counts[qidx]
+        order = np.argsort(-sims, axis=1)
+        results = []
+        for i in range(len(qidx)):
+            row = sims[i]
+            closest = [int(c) for c in order[i, :CLOSEST_CONCEPTS] if row[c] >= MATCH_SIMILARITY]
+            missing = [self.concept_names[c] for c in np.flatnonzero(own[i] & (row < MATCH_SIMILARITY))]
+            results.append({
+                "score": int(round(100 * coverage[i])),
+                "similarity": round(float(similarity[i]), 3),
+                "closest_concepts": [{"concept": self.concept_names[c], "similarity": round(float(row[c]), 3)} for c in closest],
+                "missing_concepts": missing,
+            })
+        return results
+
+    def score(self, career: str, answers: list) -> list:
+        # answers[i] responds to the career's i-th question
+        qids = self.career_questions(career)[:len(answers)]
+        return self.score_batch(qids, answers[:len(qids)])
+
+
+def _unit_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return np.divide(m, norms, out=np.zeros_like(m), where=norms > 0)
@@ -0,0 +1,189 @@
+# job_trends.py
+# Job-posting time series for /job_trends. A postings file (CSV, or Parquet with pyarrow
+# installed) is ingested once into dense per-key count arrays: one row per career and per
+# skill, one column per month. Quarterly rollups and rolling averages are computed at ingest,
+# so a query is a dictionary lookup and an array slice however many postings went in.
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+DATE_COLUMN = "posted_at"
+CAREER_COLUMN = "career"
+SKILLS_COLUMN = "skills"     # one cell per posting, e.g. "Python; SQL; Statistics"
+SKILLS_SEPARATOR = r"[;|,]"
+ROLLING_WINDOW = 3           # periods, at either granularity
+ALL_KEY = "all"              # row 0: every posting
+GRANULARITIES = {"month": 1, "quarter": 3}
+STORE_VERSION = 1
+
+
+def normalize_key(s: str) -> str:
+    return " ".join(s.split()).lower()
+
+
+def month_ordinal(d) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def parse_period(s: str, end: bool = False) -> int:
+    # "2024", "2024-03", "2024-03-15" or "2024-Q2" -> month ordinal of the period's first month,
+    # or of its last month with end=True, so "to=2024-Q2" includes June
+    s = s.strip().upper()
+    try:
+        if "-Q" in s:
+            year, quarter = s.split("-Q")
+            if not 1 <= int(quarter) <= 4:
+                raise ValueError(s)
+            return int(year) * 12 + (int(quarter) - 1) * 3 + (2 if end else 0)
+        parts = s.split("-")
+        if len(parts) == 1:
+            return int(parts[0]) * 12 + (11 if end else 0)
+        return month_ordinal(date(int(parts[0]), int(parts[1]), int(parts[2]) if len(parts) > 2 else 1))
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid period {s!r}, expected YYYY, YYYY-MM, YYYY-MM-DD or YYYY-Qn")
+
+
+def period_label(ordinal: int, granularity: str) -> str:
+    year, month0 = divmod(ordinal, 12)
+    return f"{year}-Q{month0 // 3 + 1}" if granularity == "quarter" else f"{year}-{month0 + 1:02d}"
+
+
+def _rolling_mean(counts: np.ndarray, window: int) -> np.ndarray:
+    # trailing mean along the time axis; the first periods average what they have
+    cs = np.cumsum(counts, axis=1, dtype=np.float64)
+    out = cs.copy()
+    out[:, window:] -= cs[:, :-window]
+    out /= np.minimum(np.arange(1, counts.shape[1] + 1), window)
+    return out.astype(np.float32)
+
+
+def _read_chunks(path: str, chunk_rows: int):
+    columns = [DATE_COLUMN, CAREER_COLUMN, SKILLS_COLUMN]
+    if path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq  # optional; only needed for Parquet input
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows, dtype={CAREER_COLUMN: str, SKILLS_COLUMN: str})
+
+
+class TrendStore:
+    """Immutable monthly and quarterly posting counts per career/skill key."""
+
+    def __init__(self, keys: list, start: int, monthly: np.ndarray, source: str = None):
+        # start is the month ordinal of column 0 and is always the first month of a quarter
+        self.keys = keys
+        self.rows = {k: i for i, k in enumerate(keys)}  # "career:<name>" / "skill:<name>" / "all" -> row
+        self.start = start
+        self.source = source
+        self.series = {}  # granularity -> (counts, rolling mean)
+        for granularity, step in GRANULARITIES.items():
+            counts = monthly if step == 1 else monthly.reshape(len(keys), -1, step).sum(axis=2, dtype=monthly.dtype)
+            self.series[granularity] = (counts, _rolling_mean(counts, ROLLING_WINDOW))
+
+    @classmethod
+    def ingest(cls, path: str, chunk_rows: int = 1_000_000) -> "TrendStore":
+        # each chunk is reduced to distinct (key, month) counts before it is kept, so memory
+        # follows the number of keys x months, not the number of postings
+        key_ids = {ALL_KEY: 0}
+        codes, weights = [], []
+        month_bits = 16  # month ordinals stay below 2**16 until the year 5461
+
+        def intern(values: pd.Series, prefix: str) -> np.ndarray:
+            uniques = pd.unique(values)
+            ids = np.array([key_ids.setdefault(f"{prefix}:{u}", len(key_ids)) for u in uniques], dtype=np.int64)
+            return ids[pd.Index(uniques).get_indexer(values)]
+
+        for chunk in _read_chunks(path, chunk_rows):
+            posted = pd.to_datetime(chunk[DATE_COLUMN], errors="coerce")
+            ok = posted.notna().to_numpy()
+            chunk, posted = chunk[ok].reset_index(drop=True), posted[ok].reset_index(drop=True)
+            months = (posted.dt.year * 12 + posted.dt.month - 1).to_numpy(dtype=np.int64)
+            careers = chunk[CAREER_COLUMN].fillna("").str.split().str.join(" ").str.lower()
+            careers = careers[careers != ""]
+            # one (posting, skill) pair per distinct skill, so "SQL; sql" counts once
+            skills = chunk[SKILLS_COLUMN].fillna("").str.split(SKILLS_SEPARATOR, regex=True).explode()
+            skills = skills.str.split().str.join(" ").str.lower()
+            skills = skills[skills.notna() & (skills != "")]
+            pairs = pd.DataFrame({"row": skills.index, "skill": skills.to_numpy()}).drop_duplicates()
+            chunk_codes = np.concatenate([
+                months,  # key 0
+                (intern(careers, "career") << month_bits) | months[careers.index.to_numpy()],
+                (intern(pairs["skill"], "skill") << month_bits) | months[pairs["row"].to_numpy()],
+            ])
+            uniq, counts = np.unique(chunk_codes, return_counts=True)
+            codes.append(uniq)
+            weights.append(counts)
+
+        keys = list(key_ids)
+        if not codes or not any(len(c) for c in codes):
+            return cls(keys, 0, np.zeros((len(keys), 3), dtype=np.int32), source=path)
+        codes, inverse = np.unique(np.concatenate(codes), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(weights)).astype(np.int64)
+        rows, months = codes >> month_bits, codes & ((1 << month_bits) - 1)
+        start = int(months.min()) // 3 * 3
+        end = int(months.max()) // 3 * 3 + 3  # exclusive, padded to whole quarters
+        monthly = np.zeros((len(keys), end - start), dtype=np.int32)
+        monthly[rows, months - start] = totals
+        return cls(keys, start, monthly, source=path)
+
+    def save(self, path: str):
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, version=STORE_VERSION, keys=np.array(self.keys, dtype=str), start=self.start,
+                 monthly=self.series["month"][0])
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, source: str = None) -> "TrendStore":
+        with np.load(path) as f:
+            if int(f["version"]) != STORE_VERSION:
+                raise ValueError(f"{path} was written by another store version")
+            return cls([str(k) for k in f["keys"]], int(f["start"]), f["monthly"], source=source)
+
+    @classmethod
+    def open(cls, path: str) -> "TrendStore":
+        # reuses <path>.trends.npz while it is newer than the postings file, else re-ingests
+        cache = path + ".trends.npz"
+        try:
+            if os.path.getmtime(cache) >= os.path.getmtime(path):
+                return cls.load(cache, source=path)
+        except (OSError, ValueError, KeyError):
+            pass
+        store = cls.ingest(path)
+        try:
+            store.save(cache)
+        except OSError:
+            pass  # read-only data directory: ingest again next start
+        return store
+
+    def lookup(self, q: str = None):
+        # a career name wins over a skill of the same name; None/"all" is every posting
+        if not q or normalize_key(q) == ALL_KEY:
+            return 0
+        key = normalize_key(q)
+        row = self.rows.get(f"career:{key}")
+        return row if row is not None else self.rows.get(f"skill:{key}")
+
+    def query(self, row: int, granularity: str = "month", start: int = None, end: int = None) -> list:
+        # start/end are month ordinals, both inclusive; returns the periods that overlap them
+        step = GRANULARITIES[granularity]
+        counts, rolling = self.series[granularity]
+        n = counts.shape[1]
+        lo = 0 if start is None else max(0, (start - self.start) // step)
+        hi = n if end is None else min(n, (end - self.start) // step + 1)
+        if lo >= hi:
+            return []
+        c, r, totals = counts[row, lo:hi], rolling[row, lo:hi], counts[0, lo:hi]
+        # demand index: postings per 1,000 postings in the same period
+        share = np.divide(c * 1000.0, totals, out=np.zeros(hi - lo), where=totals > 0)
+        return [{"date": period_label(self.start + (lo + i) * step, granularity), "postings": int(c[i]),
+                 "rolling_avg": round(float(r[i]), 2), "demand_index": round(float(share[i]), 2)}
+                for i in range(hi - lo)]
+
+    def stats(self) -> dict:
+        counts = self.series["month"][0]
+        return {"source": self.source, "keys": len(self.keys), "months": counts.shape[1],
+                "first_month": period_label(self.start, "month"), "postings": int(counts[0].sum()),
+                "bytes": sum(a.nbytes for pair in self.series.values() for a in pair)}
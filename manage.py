@@ -0,0 +1,96 @@
+# manage.py
+# Maintenance commands for the API database.
+#
+#   python manage.py backfill-badges [--user-id ID]
+#   python manage.py check-badges [--user-id ID]
+#   python manage.py ingest-job-trends [--path FILE]
+#   python manage.py import-quiz-bank FILE
+import argparse, json, sys
+
+import api
+
+
+def _user_ids(db, user_id):
+    if user_id is not None:
+        return [user_id]
+    return [uid for (uid,) in db.query(api.User.id).order_by(api.User.id)]
+
+
+def backfill_badges(args):
+    db = api.SessionLocal()
+    try:
+        users = _user_ids(db, args.user_id)
+        for uid in users:
+            api.rebuild_user_badges(db, uid)
+            db.commit()  # one transaction per user keeps locks short
+        print(f"rebuilt badges for {len(users)} user(s)")
+    finally:
+        db.close()
+    return 0
+
+
+def check_badges(args):
+    db = api.SessionLocal()
+    mismatched = 0
+    try:
+        users = _user_ids(db, args.user_id)
+        for uid in users:
+            expected = api.compute_badges(db, uid)
+            actual = api.materialized_badges(db, uid)
+            if expected == actual:
+                continue
+            mismatched += 1
+            for rule in api.BADGE_RULES:
+                if expected.get(rule) != actual.get(rule):
+                    print(f"user {uid} {rule}: expected {expected.get(rule)} materialized {actual.get(rule)}")
+    finally:
+        db.close()
+    print(f"{mismatched} of {len(users)} user(s) inconsistent")
+    return 1 if mismatched else 0
+
+
+def ingest_job_trends(args):
+    # rebuilds <path>.trends.npz so the API loads it at start instead of ingesting
+    from job_trends import TrendStore
+    path = args.path or api.JOB_POSTINGS_PATH
+    store = TrendStore.ingest(path)
+    store.save(path + ".trends.npz")
+    stats = store.stats()
+    print(f"ingested {stats['postings']} postings: {stats['keys']} keys x {stats['months']} months from {stats['first_month']}")
+    return 0
+
+
+def import_quiz_bank(args):
+    # FILE: {career: [{"q": ..., "options": [...], "a": ..., "difficulty": ...}, ...]}; appends
+    with open(args.file, encoding="utf-8") as f:
+        bank = json.load(f)
+    db = api.SessionLocal()
+    try:
+        added = api.import_quiz_questions(db, bank)
+        db.commit()
+    finally:
+        db.close()
+    print(f"imported {added} question(s) for {len(bank)} career(s)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintenance commands for the API database.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, fn, help_text in (("backfill-badges", backfill_badges, "recompute user_badges from saves and quiz scores"),
+                                ("check-badges", check_badges, "compare user_badges with the current badge rules")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--user-id", type=int)
+        cmd.set_defaults(func=fn)
+    cmd = sub.add_parser("ingest-job-trends", help="ingest the job postings file into the trend store")
+    cmd.add_argument("--path", help="postings CSV/Parquet (default: JOB_POSTINGS_PATH)")
+    cmd.set_defaults(func=ingest_job_trends)
+    cmd = sub.add_parser("import-quiz-bank", help="append questions from a JSON file to the quiz bank")
+    cmd.add_argument("file")
+    cmd.set_defaults(func=import_quiz_bank)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
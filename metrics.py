@@ -0,0 +1,171 @@
+# metrics.py
+# In-process request metrics in the Prometheus text format: per-route latency histograms,
+# status counts, requests in flight, SQL statements and SQL time per request, and PDF stage
+# timings. A request costs two perf_counter() calls, a few dict lookups and a bisect; the
+# text is only built when /metrics is scraped.
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED = "<unmatched>"  # 404s etc. share one label, so random paths can't grow the series
+
+_request = ContextVar("metrics_request", default=None)  # RequestStats of the running request
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    esc = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, esc)) + "}"
+
+
+def _num(v) -> str:
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.values = {}  # label values tuple -> number
+
+    def inc(self, labels=(), amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, v in self.values.items():
+            yield self.name, self.labelnames, labels, v
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, labels=(), value=0):
+        self.values[labels] = value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}  # label values tuple -> [count per bucket..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        s[bisect_left(self.buckets, value)] += 1
+        s[-1] += value
+
+    def samples(self):
+        names = self.labelnames + ("le",)
+        for labels, s in self.series.items():
+            total = 0
+            for bound, n in zip(self.buckets + ("+Inf",), s):
+                total += n
+                yield self.name + "_bucket", names, labels + (_num(bound) if bound != "+Inf" else bound,), total
+            yield self.name + "_sum", self.labelnames, labels, s[-1]
+            yield self.name + "_count", self.labelnames, labels, total
+
+
+class RequestStats:
+    __slots__ = ("queries", "sql_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+
+
+class Metrics:
+    """Every metric the API exposes. Updated from the event loop thread only; SQL time from
+    worker threads goes into the request's own RequestStats and is folded in when it ends."""
+
+    def __init__(self):
+        self.requests = Counter("http_requests_total", "Requests by method, route and status.", ("method", "route", "status"))
+        self.latency = Histogram("http_request_duration_seconds", "Request latency, until the last body byte is sent.", ("method", "route"))
+        self.in_flight = Gauge("http_requests_in_flight", "Requests being served.")
+        self.sql_queries = Histogram("http_request_sql_queries", "SQL statements executed per request.", ("route",), QUERY_BUCKETS)
+        self.sql_seconds = Histogram("http_request_sql_seconds", "Time spent in SQL per request.", ("route",))
+        self.pdf_work = Histogram("pdf_stage_seconds", "Time inside the PDF worker process (PyPDF2 extract, ReportLab render).", ("stage",))
+        self.pdf_wall = Histogram("pdf_stage_wall_seconds", "PDF stage from submit to result, queueing included.", ("stage", "outcome"))
+        self.pdf_pending = Gauge("pdf_pool_pending_jobs", "Running plus queued jobs per PDF worker pool.", ("stage",))
+        self.in_flight.set((), 0)
+
+    def families(self):
+        return (self.requests, self.latency, self.in_flight, self.sql_queries, self.sql_seconds,
+                self.pdf_work, self.pdf_wall, self.pdf_pending)
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        self.requests.inc((method, route, str(status)))
+        self.latency.observe((method, route), seconds)
+        self.sql_queries.observe((route,), stats.queries)
+        if stats.queries:
+            self.sql_seconds.observe((route,), stats.sql_seconds)
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, labelnames, labels, value in family.samples():
+                lines.append(f"{name}{_labels(labelnames, labels)} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Plain ASGI middleware (no per-request task or body buffering, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = 500  # unless a response starts; unhandled errors become 500s further out
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        m = self.metrics
+        stats = RequestStats()
+        token = _request.set(stats)
+        m.in_flight.inc()
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            seconds = perf_counter() - start
+            m.in_flight.inc((), -1)
+            _request.reset(token)
+            # the router leaves the matched route in the scope; its path is the template, e.g. /history
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED
+            m.observe_request(scope["method"], route, status, seconds, stats)
+
+
+def instrument_engine(engine):
+    # statements run for a request are counted and timed into its RequestStats; the context
+    # variable follows the request into threadpool workers and the async driver's greenlets.
+    # Statements outside a request (startup, migrations) aren't counted.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _request.get() is not None:
+            context._metrics_start = perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = _request.get()
+        start = getattr(context, "_metrics_start", None)
+        if stats is not None and start is not None:
+            stats.queries += 1
+            stats.sql_seconds += perf_counter() - start
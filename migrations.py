@@ -0,0 +1,111 @@
+# migrations.py
+# Ordered schema migrations for databases created before a model change.
+# create_all() only creates missing tables; anything that alters an existing table
+# (new indexes, columns, backfills) is a numbered step here, applied once and recorded
+# in schema_migrations. Steps must be idempotent: a fresh database already has the
+# new schema from create_all() by the time they run.
+import json
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from badge_rules import earned_badges
+from payload_summary import summarize_payload
+
+MIGRATIONS = []
+
+
+def migration(version: int, name: str):
+    def register(fn):
+        MIGRATIONS.append((version, name, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+def create_index(conn, name: str, table: str, columns: str):
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def add_column(conn, table: str, column: str, ddl: str):
+    if column not in {c["name"] for c in inspect(conn).get_columns(table)}:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+@migration(1, "history and quiz score keyset indexes")
+def _keyset_indexes(conn):
+    create_index(conn, "ix_saved_recommendations_user_created", "saved_recommendations", "user_id, created_at, id")
+    create_index(conn, "ix_quiz_scores_user_created", "quiz_scores", "user_id, created_at, id")
+
+
+@migration(2, "saved recommendation summary columns")
+def _summary_columns(conn):
+    add_column(conn, "saved_recommendations", "kind", "VARCHAR")
+    add_column(conn, "saved_recommendations", "top_career", "VARCHAR")
+    add_column(conn, "saved_recommendations", "top_score", "FLOAT")
+    create_index(conn, "ix_saved_recommendations_user_kind", "saved_recommendations", "user_id, kind")
+    # backfill: every existing blob is decoded once, here, in id-ordered batches
+    last_id = 0
+    while True:
+        rows = conn.execute(text("SELECT id, data FROM saved_recommendations WHERE id > :last ORDER BY id LIMIT 500"),
+                            {"last": last_id}).fetchall()
+        if not rows:
+            break
+        updates = []
+        for row_id, data in rows:
+            try:
+                payload = json.loads(data)
+            except (TypeError, ValueError):
+                payload = None
+            kind, top_career, top_score = summarize_payload(payload)
+            updates.append({"id": row_id, "kind": kind, "top_career": top_career, "top_score": top_score})
+        conn.execute(text("UPDATE saved_recommendations SET kind = :kind, top_career = :top_career, "
+                          "top_score = :top_score WHERE id = :id"), updates)
+        last_id = rows[-1][0]
+
+
+@migration(3, "quiz score totals")
+def _quiz_score_totals(conn):
+    add_column(conn, "quiz_scores", "total", "INTEGER")
+    # attempts before this were graded against the built-in bank of two Python and two SQL
+    # questions; other careers had none, so a score of 0 counted as perfect
+    conn.execute(text("UPDATE quiz_scores SET total = CASE career WHEN 'Python' THEN 2 WHEN 'SQL' THEN 2 ELSE 0 END "
+                      "WHERE total IS NULL"))
+
+
+@migration(4, "user badges backfill")
+def _badge_backfill(conn):
+    # user_badges is only written by /save and /submit_quiz; users from before it existed had
+    # none. Rebuilt for every user from their saves and attempts, in id-ordered batches.
+    last_id = 0
+    while True:
+        users = [uid for (uid,) in conn.execute(text("SELECT id FROM users WHERE id > :last ORDER BY id LIMIT 500"),
+                                                 {"last": last_id})]
+        if not users:
+            break
+        for uid in users:
+            saves = conn.execute(text("SELECT title, data, created_at FROM saved_recommendations "
+                                      "WHERE user_id = :u ORDER BY id"), {"u": uid}).fetchall()
+            quizzes = conn.execute(text("SELECT career, score, total, created_at FROM quiz_scores "
+                                        "WHERE user_id = :u ORDER BY id"), {"u": uid}).fetchall()
+            conn.execute(text("DELETE FROM user_badges WHERE user_id = :u"), {"u": uid})
+            rows = [{"u": uid, "rule": rule, "badge_id": badge_id, "name": name, "at": earned_at}
+                    for rule, (badge_id, name, earned_at) in earned_badges(saves, quizzes).items()]
+            if rows:
+                conn.execute(text("INSERT INTO user_badges (user_id, rule, badge_id, name, earned_at) "
+                                  "VALUES (:u, :rule, :badge_id, :name, :at)"), rows)
+        last_id = users[-1]
+
+
+def run_migrations(engine):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_migrations "
+                          "(version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at DATETIME NOT NULL)"))
+        applied = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+    for version, name, fn in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:  # one transaction per step
+            fn(conn)
+            conn.execute(text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                         {"v": version, "n": name, "t": datetime.utcnow()})
@@ -0,0 +1,57 @@
+# password_hashing.py
+# bcrypt runs on its own small thread pool (bcrypt releases the GIL) with a hard queue limit,
+# so a login burst gets fast rejections instead of starving Starlette's shared threadpool.
+import asyncio, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HashingBusy(Exception):
+    """Raised instead of queueing when max_pending hash/verify jobs are already waiting."""
+
+
+class HashingPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0  # only touched from the event loop thread
+        self.rejected = 0
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()  # latency counters are updated from the worker threads
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.count += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+
+    def _release(self, fut):
+        self.pending -= 1
+        if not fut.cancelled():
+            fut.exception()  # mark retrieved when the caller has gone away
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingBusy()
+        fut = asyncio.get_running_loop().run_in_executor(self._executor, self._timed, fn, *args)
+        self.pending += 1
+        # released when the worker finishes, even if the client went away in the meantime
+        fut.add_done_callback(self._release)
+        return await asyncio.shield(fut)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "pending": self.pending, "max_pending": self.max_pending,
+                "rejected": self.rejected, "count": self.count,
+                "avg_ms": round(self.total_seconds / self.count * 1000, 2) if self.count else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 2)}
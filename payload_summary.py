@@ -0,0 +1,16 @@
+# payload_summary.py
+# Summary fields denormalized out of a saved payload, so listings never decode the JSON blob.
+
+
+def summarize_payload(payload: dict):
+    """Return (kind, top_career, top_score) for a saved advice/resume payload."""
+    if not isinstance(payload, dict):
+        return "other", None, None
+    if "top_careers" in payload:
+        top = payload.get("top_careers")
+        top0 = top[0] if isinstance(top, list) and top and isinstance(top[0], dict) else {}
+        score = top0.get("match_score")
+        return "advice", top0.get("career"), float(score) if isinstance(score, (int, float)) else None
+    if "suggestions" in payload or "skills" in payload:
+        return "resume", None, None
+    return "other", None, None
@@ -0,0 +1,246 @@
+# pdf_tools.py
+# PDF work kept off the event loop: runs in a bounded process pool with timeouts.
+import asyncio, hashlib, io, itertools, json, multiprocessing, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyPDF2 import PdfReader
+
+
+class PoolBusy(Exception):
+    """Raised instead of queueing when the pool already has max_pending jobs."""
+
+
+class PoolTimeout(Exception):
+    """Raised when a job does not finish within the pool's timeout once a worker started it."""
+
+
+def timed_call(fn, *args):
+    # runs inside a worker process: (result, seconds fn took), without queueing or pickling
+    start = time.perf_counter()
+    return fn(*args), time.perf_counter() - start
+
+
+def extract_text(contents: bytes, max_pages: int) -> str:
+    # runs inside a worker process
+    reader = PdfReader(io.BytesIO(contents))
+    text = ""
+    for page in itertools.islice(reader.pages, max_pages):
+        text += page.extract_text() or ""
+    return text
+
+
+def _report_lines(payload: dict, generated: str):
+    # (text, extra space above it in points), in document order
+    lines = [("AI Career Advisor Report", 0), (f"Generated: {generated}", 18)]
+    gap = 24
+    # --- Case 1: Career Recommendation ---
+    if "top_careers" in payload:
+        lines.append(("=== Career Recommendations ===", gap))
+        for idx, cobj in enumerate(payload.get("top_careers", []), start=1):
+            lines.append((f"{idx}. {cobj.get('career')} - Match: {cobj.get('match_score')}%", 16))
+            if cobj.get("matched_skills"):
+                lines.append((f"   Matched: {', '.join(cobj['matched_skills'])}", 14))
+            if cobj.get("missing_skills"):
+                lines.append((f"   Missing: {', '.join(cobj['missing_skills'])}", 14))
+    # --- Case 2: Resume Enhancement ---
+    elif "suggestions" in payload or "skills" in payload:
+        lines.append(("=== Resume Enhancement Report ===", gap))
+        skills = payload.get("skills", [])
+        suggestions = payload.get("suggestions", [])
+        if skills:
+            lines.append((f"Extracted Skills: {', '.join(skills)}", 16))
+        if suggestions:
+            lines.append(("Improvement Suggestions:", 20))
+            for s in suggestions:
+                lines.append((f"- {s}", 14))
+    else:
+        lines.append(("No data provided.", gap))
+    return lines
+
+
+def render_report(payload: dict, generated: str) -> bytes:
+    # runs inside a worker process; long lines wrap and long reports continue on new pages
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+
+    font, size, leading = "Helvetica", 12, 14.4
+    left, top, bottom = 40, 750, 50
+    max_width = letter[0] - 2 * left
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.setFont(font, size)
+    y = top
+    for text, gap in _report_lines(payload, generated):
+        indent = len(text) - len(text.lstrip(" "))
+        parts = simpleSplit(text, font, size, max_width) or [""]
+        for i, part in enumerate(parts):
+            if i == 0:
+                y -= gap
+            else:
+                part = " " * (indent + 2) + part  # continuation lines hang under the text
+            if y < bottom:
+                c.showPage()
+                c.setFont(font, size)
+                y = top
+            c.drawString(left, y, part)
+            y -= leading
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def report_key(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """Rendered PDFs by payload hash; LRU bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: str):
+        pdf = self._entries.get(key)
+        if pdf is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return pdf
+
+    def put(self, key: str, pdf: bytes):
+        if len(pdf) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = pdf
+        self._bytes += len(pdf)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def _worker_main(conn):
+    # a pool worker process: runs (fn, args) jobs from the pipe until it is closed or killed
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = (True, fn(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:  # the result or the exception doesn't pickle
+            conn.send((False, RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """One worker process and our end of its pipe."""
+
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class BoundedProcessPool:
+    """Worker processes that each run one job at a time. A job's timeout starts when a worker
+    picks it up, not while it waits for one; on timeout that worker is killed and replaced, so
+    a stuck document costs one restart instead of a worker for good."""
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0  # running + queued jobs; only touched from the event loop thread
+        self.restarts = 0  # workers killed after a timeout or replaced after dying
+        self._slots = asyncio.Semaphore(workers)
+        self._idle = []  # started workers without a job
+        self._lock = threading.Lock()
+        self._closed = False
+        # each running job has a thread that feeds its worker and waits on the pipe
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-pool")
+        # spawn rather than fork: the server process has threads; workers only need this module
+        self._ctx = multiprocessing.get_context("spawn")
+
+    def _call(self, fn, args):
+        # runs in one of self._threads, with a slot held
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is None:
+            worker = _Worker(self._ctx)
+        try:
+            worker.conn.send((fn, args))
+            if not worker.conn.poll(self.timeout):
+                self._discard(worker)
+                worker = None
+                raise PoolTimeout()
+            ok, value = worker.conn.recv()
+        except (EOFError, OSError):
+            self._discard(worker)
+            worker = None
+            raise BrokenProcessPool("a PDF worker process died")
+        finally:
+            if worker is not None:
+                with self._lock:
+                    if self._closed:
+                        worker.kill()
+                    else:
+                        self._idle.append(worker)
+        if not ok:
+            raise value
+        return value
+
+    def _discard(self, worker):
+        worker.kill()
+        self.restarts += 1  # its replacement starts with the next job
+
+    def _release(self, fut):
+        self.pending -= 1
+        self._slots.release()
+        if not fut.cancelled():
+            fut.exception()  # mark retrieved; callers that gave up never look at it
+
+    async def run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise PoolBusy()
+        self.pending += 1
+        try:
+            await self._slots.acquire()  # queued jobs wait here, outside the timeout
+        except BaseException:
+            self.pending -= 1
+            raise
+        fut = asyncio.get_running_loop().run_in_executor(self._threads, self._call, fn, args)
+        # the slot is released when the worker is done or killed, even if the caller went away
+        fut.add_done_callback(self._release)
+        return await asyncio.shield(fut)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+        self._threads.shutdown(wait=False, cancel_futures=True)
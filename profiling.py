@@ -0,0 +1,197 @@
+# profiling.py
+# Opt-in per-request profiling. A chosen request runs under cProfile (deterministic, event loop
+# thread) and a stack sampler (every thread, so sync handlers in the threadpool show up too);
+# the results land in a bounded ring of files: <id>.json (what was profiled), <id>.pstats
+# (load with pstats / snakeviz) and <id>.collapsed (flamegraph.pl / speedscope input).
+# Only one request is profiled at a time; others that ask meanwhile run unprofiled.
+#
+# Neither profiler can tell requests apart. cProfile sees everything the event loop runs while
+# it is on, and the sampler sees every thread, so whatever other requests execute while the
+# profiled one awaits (its own coroutines, their threadpool work) lands in the same profile.
+# Each profile's metadata counts those overlapping requests: "exclusive": true means there were
+# none and everything in it is this request's; otherwise read it as "the process while this
+# request ran". For a clean profile, profile on an otherwise idle worker.
+import cProfile, json, os, random, re, sys, threading, time
+from collections import Counter
+
+from starlette.concurrency import run_in_threadpool
+
+PROFILE_ID = re.compile(r"^[0-9]{19}-[a-z0-9_]+$")
+# leaf frames of threads that are only waiting; dropped so idle workers don't swamp the samples
+IDLE_FRAMES = {("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"), ("queue.py", "get"),
+               ("selectors.py", "select"), ("thread.py", "_worker")}
+
+
+class StackSampler(threading.Thread):
+    """Counts collapsed stacks ("thread;outer;...;inner") of every other thread every `interval` seconds."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._done.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self.samples += 1
+            for tid, frame in sys._current_frames().items():
+                if tid == me or (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(tid, str(tid)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self._done.set()
+        self.join()
+        return self.stacks
+
+
+class ProfileStore:
+    """The newest `keep` profiles in one directory; shared by every worker pointed at it."""
+
+    def __init__(self, directory: str, keep: int):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+
+    def new_id(self, method: str, path: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "_", f"{method} {path}".lower()).strip("_")[:60]
+        return f"{time.time_ns()}-{slug}"
+
+    def path(self, profile_id: str, ext: str) -> str:
+        if not PROFILE_ID.match(profile_id):
+            raise KeyError(profile_id)  # ids come from URLs; never let one escape the directory
+        return os.path.join(self.directory, f"{profile_id}.{ext}")
+
+    def save(self, profile_id: str, meta: dict, profiler, stacks: Counter):
+        # pstats and collapsed first, metadata last: a listed profile is always complete
+        if profiler is not None:
+            profiler.dump_stats(self.path(profile_id, "pstats"))
+        with open(self.path(profile_id, "collapsed"), "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {n}\n" for stack, n in stacks.most_common())
+        tmp = self.path(profile_id, "json") + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.path(profile_id, "json"))
+        self.trim()
+
+    def ids(self) -> list:
+        # newest first; ids start with a nanosecond timestamp, so names sort by age
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted((n[:-5] for n in names if n.endswith(".json") and PROFILE_ID.match(n[:-5])), reverse=True)
+
+    def trim(self):
+        for profile_id in self.ids()[self.keep:]:
+            for ext in ("json", "pstats", "collapsed"):
+                try:
+                    os.remove(self.path(profile_id, ext))
+                except OSError:
+                    pass
+
+    def list(self) -> list:
+        out = []
+        for profile_id in self.ids():
+            try:
+                with open(self.path(profile_id, "json"), encoding="utf-8") as f:
+                    out.append(json.load(f))
+            except (OSError, ValueError):
+                pass  # trimmed by another worker in between
+        return out
+
+    def read(self, profile_id: str, ext: str) -> bytes:
+        with open(self.path(profile_id, ext), "rb") as f:
+            return f.read()
+
+
+class ProfilingMiddleware:
+    """Profiles a request when it carries `X-Profile: 1` with the admin token, or when it is
+    picked at `sample_rate`. The response gets an X-Profile-Id header naming the profile.
+
+    The profile covers the whole process for the request's duration, not just its task: other
+    requests running meanwhile are in it too. Their number is saved as `overlapping_requests`."""
+
+    def __init__(self, app, store: ProfileStore, admin_token: str = None, sample_rate: float = 0.0,
+                 interval: float = 0.002):
+        self.app = app
+        self.store = store
+        self.admin_token = admin_token.encode() if admin_token else None
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._busy = threading.Lock()
+        self._in_flight = 0  # unprofiled requests running now (event loop thread only)
+        self._overlapping = None  # while profiling: other requests that ran during it
+
+    async def _run_unprofiled(self, scope, receive, send):
+        self._in_flight += 1
+        if self._overlapping is not None:
+            self._overlapping += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    def _trigger(self, scope):
+        if self.admin_token is not None:
+            headers = dict(scope["headers"])
+            if headers.get(b"x-profile") == b"1" and headers.get(b"x-admin-token") == self.admin_token:
+                return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        trigger = self._trigger(scope)
+        if trigger is None or not self._busy.acquire(blocking=False):
+            return await self._run_unprofiled(scope, receive, send)
+        profile_id = self.store.new_id(scope["method"], scope["path"])
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                profiler = None  # another profiling tool already owns this thread
+            sampler = StackSampler(self.interval)
+            sampler.start()
+            self._overlapping = self._in_flight
+            start = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                seconds = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.disable()
+                stacks = sampler.stop()
+                overlapping, self._overlapping = self._overlapping, None
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                meta = {"id": profile_id, "method": scope["method"], "route": route, "path": scope["path"],
+                        "status": status, "seconds": round(seconds, 6), "trigger": trigger,
+                        "samples": sampler.samples, "pstats": profiler is not None, "at": time.time(),
+                        "overlapping_requests": overlapping, "exclusive": overlapping == 0}
+                try:
+                    await run_in_threadpool(self.store.save, profile_id, meta, profiler, stacks)
+                except OSError:
+                    pass  # the response is already out; a full or read-only disk only loses the profile
+        finally:
+            self._busy.release()
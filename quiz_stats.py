@@ -0,0 +1,118 @@
+# quiz_stats.py
+# Per-career score distributions for leaderboards and percentile ranks. Scores are whole
+# percentages, so a 101-bucket histogram is an exact order-statistics structure: every rank
+# or percentile query walks at most 101 counters, however many attempts there are.
+import threading
+
+BUCKETS = 101  # 0..100 percent
+# quizzes with fewer questions are stored and shown in /quiz_scores, but a 1-question quiz is a
+# coin flip away from 100%: they don't enter leaderboards or percentiles, or count as perfect
+MIN_RANKED_QUESTIONS = 2
+
+
+def score_pct(score: int, total: int) -> int:
+    return round(100 * score / total) if total else 0
+
+
+def is_ranked(total) -> bool:
+    return (total or 0) >= MIN_RANKED_QUESTIONS
+
+
+class CareerScores:
+    __slots__ = ("attempts", "n_attempts", "best", "by_best")
+
+    def __init__(self):
+        self.attempts = [0] * BUCKETS        # attempts per percentage
+        self.n_attempts = 0
+        self.best = {}                       # user id -> best percentage
+        # percentage -> {user id: when it was first reached}; insertion order is that time
+        # order, so each bucket lists its tied users earliest first without sorting
+        self.by_best = [dict() for _ in range(BUCKETS)]
+
+    def record(self, user_id: int, pct: int, at):
+        self.attempts[pct] += 1
+        self.n_attempts += 1
+        old = self.best.get(user_id)
+        if old is None or pct > old:
+            if old is not None:
+                del self.by_best[old][user_id]
+            self.best[user_id] = pct
+            self.by_best[pct][user_id] = at
+
+    def percentile(self, pct: int) -> float:
+        # share of attempts below this one, counting ties as half
+        if not self.n_attempts:
+            return 0.0
+        below = sum(self.attempts[:pct])
+        return round(100 * (below + 0.5 * self.attempts[pct]) / self.n_attempts, 1)
+
+    def rank(self, user_id: int):
+        # 1 + users with a strictly better best; None if the user has no attempts
+        pct = self.best.get(user_id)
+        if pct is None:
+            return None
+        return 1 + sum(len(b) for b in self.by_best[pct + 1:])
+
+    def leaders(self, limit: int) -> list:
+        # [(rank, user id, best percentage, when reached)], competition ranking for ties
+        out = []
+        rank = 1
+        for pct in range(BUCKETS - 1, -1, -1):
+            bucket = self.by_best[pct]
+            for user_id, at in bucket.items():
+                if len(out) == limit:
+                    return out
+                out.append((rank, user_id, pct, at))
+            rank += len(bucket)
+        return out
+
+
+class QuizStats:
+    """CareerScores for every career, updated in place on each submission."""
+
+    def __init__(self):
+        self._careers = {}
+        self._lock = threading.Lock()  # records come from the event loop, rebuilds from a worker thread
+
+    def record(self, user_id: int, career: str, score: int, total: int, at):
+        # returns the attempt's percentile among all attempts for the career, itself included;
+        # None for quizzes too short to rank
+        if not is_ranked(total):
+            return None
+        pct = score_pct(score, total)
+        with self._lock:
+            scores = self._careers.get(career)
+            if scores is None:
+                scores = self._careers[career] = CareerScores()
+            scores.record(user_id, pct, at)
+            return scores.percentile(pct)
+
+    def load(self, rows):
+        # rows: (user_id, career, score, total, created_at) in id order; replaces everything
+        careers = {}
+        for user_id, career, score, total, at in rows:
+            if not is_ranked(total):
+                continue
+            scores = careers.get(career)
+            if scores is None:
+                scores = careers[career] = CareerScores()
+            scores.record(user_id, score_pct(score or 0, total or 0), at)
+        with self._lock:
+            self._careers = careers
+
+    def leaderboard(self, career: str, limit: int, user_id: int = None) -> dict:
+        with self._lock:
+            scores = self._careers.get(career)
+            if scores is None:
+                return {"attempts": 0, "players": 0, "leaders": [], "you": None}
+            you = None
+            if user_id in scores.best:
+                best = scores.best[user_id]
+                you = {"rank": scores.rank(user_id), "best_pct": best, "percentile": scores.percentile(best)}
+            return {"attempts": scores.n_attempts, "players": len(scores.best),
+                    "leaders": scores.leaders(limit), "you": you}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"careers": len(self._careers), "attempts": sum(s.n_attempts for s in self._careers.values()),
+                    "players": sum(len(s.best) for s in self._careers.values())}
@@ -0,0 +1,83 @@
+# response_cache.py
+# Encoded responses of the pure endpoints, keyed on canonical inputs (e.g. the sorted skill ids
+# of an /advise query, so "python, SQL" and "SQL,Python" share an entry). Each entry remembers
+# the object it was computed from (a catalog snapshot, the trend store, ...) and is only
+# served while that object is still the live one, so a reload never serves stale results.
+import hashlib, threading, time
+from collections import OrderedDict
+from typing import NamedTuple
+
+import fast_json
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str        # weak: same content, whatever the request echoed around it
+    source: object   # what the body was computed from
+    deadline: float
+
+
+class ResponseCache:
+    """TTL-bounded LRU of encoded JSON bodies, bounded by entry count and by total body bytes
+    (an unlimited /advise body is the whole ranked catalog). ttl <= 0 or a zero bound disables it."""
+
+    def __init__(self, max_entries: int, ttl: float, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> CachedBody
+        self._bytes = 0
+        self._lock = threading.Lock()  # sync endpoints call in from threadpool workers
+        self.hits = self.misses = self.invalidations = self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0 and self.max_bytes > 0
+
+    def _drop(self, key):
+        self._bytes -= len(self._entries.pop(key).body)
+
+    def get(self, key, source):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.source is not source or time.time() >= entry.deadline:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, source, obj) -> CachedBody:
+        # obj: anything JSON-encodable, or bytes that already are the encoded body
+        body = obj if isinstance(obj, bytes) else fast_json.dumps(obj)
+        entry = CachedBody(body, 'W/"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest(), source, time.time() + self.ttl)
+        if self.enabled and len(body) <= self.max_bytes:  # bigger bodies are served, just not kept
+            with self._lock:
+                if key in self._entries:
+                    self._drop(key)
+                self._entries[key] = entry
+                self._bytes += len(body)
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+                    self.evictions += 1
+        return entry
+
+    def fetch(self, key, source, compute) -> CachedBody:
+        # compute() runs outside the lock; two concurrent misses both compute, and both are right
+        entry = self.get(key, source)
+        return entry if entry is not None else self.put(key, source, compute())
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "bytes": self._bytes,
+                "max_bytes": self.max_bytes, "ttl_seconds": self.ttl, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "invalidations": self.invalidations}
@@ -0,0 +1,151 @@
+# resume_cache.py
+# Content-addressed cache for extracted resume text and the skills derived from it.
+import hashlib, json, os, threading
+from collections import OrderedDict
+
+DISK_PRUNE_TO = 0.9  # pruning removes oldest files until the disk tier is at 90% of its budget
+
+
+def content_key(contents: bytes) -> str:
+    return hashlib.sha256(contents).hexdigest()
+
+
+def _entry_size(entry: dict) -> int:
+    # UTF-8 bytes, not characters: the budget is in bytes and resumes aren't all ASCII
+    return len(entry.get("text", "").encode("utf-8")) + sum(len(s.encode("utf-8")) for s in entry.get("skills", ()))
+
+
+class ResumeCache:
+    """Byte-bounded in-memory LRU, optionally backed by one JSON file per key on disk.
+
+    get/put/from_disk touch only memory and belong on the event loop. read_disk/write_disk do
+    file I/O: run them in a thread. The disk tier is bounded by disk_max_bytes; when a write
+    takes it over, the least recently modified files go first (a disk hit refreshes its file's
+    mtime). Several processes may share disk_dir: each prune re-measures the directory."""
+
+    def __init__(self, max_bytes: int, disk_dir: str = None, disk_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = self.disk_evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + ".json")
+
+    def _disk_files(self):
+        # [(path, size, mtime)] of every cached entry on disk
+        files = []
+        for sub in os.scandir(self.disk_dir):
+            if not sub.is_dir():
+                continue
+            for f in os.scandir(sub.path):
+                if f.name.endswith(".json"):
+                    try:
+                        st = f.stat()
+                    except OSError:
+                        continue  # pruned by another process meanwhile
+                    files.append((f.path, st.st_size, st.st_mtime))
+        return files
+
+    def read_disk(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # recently used, so pruned last
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def write_disk(self, key: str, entry: dict):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = json.dumps(entry).encode("utf-8")
+            if self.disk_max_bytes and len(data) > self.disk_max_bytes:
+                return
+            try:
+                old = os.path.getsize(path)
+            except OSError:
+                old = 0
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)  # readers never see a half-written file
+        except OSError:
+            return  # the disk tier is best effort
+        with self._disk_lock:
+            self._disk_bytes += len(data) - old
+            if self.disk_max_bytes and self._disk_bytes > self.disk_max_bytes:
+                self._prune_disk()
+
+    def _prune_disk(self):
+        # called with _disk_lock held
+        files = sorted(self._disk_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * DISK_PRUNE_TO
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.disk_evictions += 1
+        self._disk_bytes = total
+
+    def _store(self, key: str, entry: dict):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= _entry_size(old)
+        size = _entry_size(entry)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= _entry_size(evicted)
+            self.evictions += 1
+
+    def get(self, key: str):
+        # memory tier; on a miss with a disk tier, read_disk then from_disk finish the lookup
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if not self.disk_dir:
+            self.misses += 1
+        return None
+
+    def from_disk(self, key: str, entry):
+        # the result of read_disk(key), back on the loop
+        if entry is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._store(key, entry)
+        return entry
+
+    def put(self, key: str, entry: dict) -> dict:
+        # memory tier; write_disk(key, entry) persists it
+        self._store(key, entry)
+        return entry
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_bytes": self._disk_bytes if self.disk_dir else None, "disk_max_bytes": self.disk_max_bytes,
+                "disk_evictions": self.disk_evictions,
+                "hit_ratio": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0}
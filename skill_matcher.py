@@ -0,0 +1,152 @@
+# skill_matcher.py
+# Precompiled skill -> career matching engine used by /advise and /advise/batch, and the
+# multi-pattern keyword automaton used to find skills/keywords in free text.
+import hashlib, heapq
+
+
+def normalize_skill(s: str) -> str:
+    # the normalization career matching has always used ("machine learning" -> "Machine learning")
+    return s.strip().capitalize()
+
+
+class SkillMatcher:
+    """Index over a career catalog: interned skill ids, per-career sparse skill vectors and an inverted index."""
+
+    def __init__(self, catalog: dict):
+        self.skill_ids = {}        # normalized skill -> int id
+        self.careers = []          # catalog order; ties in score keep this order
+        self.roadmaps = []
+        self.skill_names = []      # career idx -> sorted [(normalized skill, id)], distinct
+        self.sizes = []            # career idx -> number of distinct required skills
+        self.postings = {}         # skill id -> [career idx, ...]
+
+        for idx, (career, details) in enumerate(catalog.items()):
+            names = sorted({normalize_skill(s) for s in details["required_skills"]})
+            for name in names:
+                sid = self.skill_ids.setdefault(name, len(self.skill_ids))
+                self.postings.setdefault(sid, []).append(idx)
+            self.careers.append(career)
+            self.roadmaps.append(details["roadmap"])
+            self.skill_names.append([(n, self.skill_ids[n]) for n in names])
+            self.sizes.append(len(names))
+
+    def parse(self, user_skills: str) -> set:
+        # unknown skills can never match anything, so they are dropped here
+        ids = set()
+        for s in user_skills.split(","):
+            sid = self.skill_ids.get(normalize_skill(s)) if s.strip() else None
+            if sid is not None:
+                ids.add(sid)
+        return ids
+
+    def _score(self, idx: int, hits: int) -> float:
+        size = self.sizes[idx]
+        return round((hits / size) * 100, 2) if size else 0.0
+
+    def rank(self, user_ids: set, limit: int = None) -> list:
+        # count hits through the inverted index; careers never touched score 0
+        hits = {}
+        for sid in user_ids:
+            for idx in self.postings.get(sid, ()):
+                hits[idx] = hits.get(idx, 0) + 1
+        scored = [(-self._score(idx, n), idx) for idx, n in hits.items()]
+        n_total = len(self.careers)
+        k = n_total if limit is None else min(limit, n_total)
+
+        top = heapq.nsmallest(k, scored) if k < len(scored) else sorted(scored)
+        # zero scores (no hits, or a hit count that rounds to 0) keep catalog order, as sorted() did
+        ranked = [idx for neg, idx in top if neg < 0]
+        if len(ranked) < k:
+            for idx in range(n_total):
+                if len(ranked) == k:
+                    break
+                if idx not in hits or self._score(idx, hits[idx]) == 0:
+                    ranked.append(idx)
+        return ranked
+
+    def result(self, idx: int, user_ids: set) -> dict:
+        matched, missing = [], []
+        for name, sid in self.skill_names[idx]:
+            (matched if sid in user_ids else missing).append(name)
+        return {"career": self.careers[idx], "match_score": self._score(idx, len(matched)),
+                "matched_skills": matched, "missing_skills": missing, "roadmap": self.roadmaps[idx]}
+
+
+def normalize_text(text: str) -> str:
+    # lowercase and collapse whitespace, so "Machine\nLearning" matches "machine learning"
+    return " ".join(text.lower().split())
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: finds every (pattern -> label) in one pass over the text.
+
+    Matches must start at a word boundary; with whole_word they must also end at one
+    ("sql" does not match inside "nosql"), otherwise a pattern also matches as a word
+    prefix ("train" matches "training").
+    """
+
+    def __init__(self, patterns, whole_word: bool = True):
+        self.whole_word = whole_word
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]  # state -> ((label, pattern length), ...), including suffix matches
+        seen = set()
+        for pattern, label in patterns:
+            pattern = normalize_text(pattern)
+            if not pattern or (pattern, label) in seen:
+                continue
+            seen.add((pattern, label))
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({}); self.fail.append(0); self.out.append(())
+                state = nxt
+            self.out[state] += ((label, len(pattern)),)
+
+        queue = list(self.goto[0].values())
+        for state in queue:  # BFS; the list grows while we walk it
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+        key = "\n".join(sorted(f"{p}\t{l}" for p, l in seen)) + f"\n{whole_word}"
+        self.fingerprint = hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def find(self, text: str, normalized: bool = False) -> set:
+        if not normalized:
+            text = normalize_text(text)
+        goto, fail, out = self.goto, self.fail, self.out
+        found = set()
+        state = 0
+        last = len(text) - 1
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for label, length in out[state]:
+                start = i - length + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if self.whole_word and i < last and text[i + 1].isalnum():
+                    continue
+                found.add(label)
+        return found
+
+
+def build_skill_extractor(catalog: dict, aliases: dict = None) -> KeywordAutomaton:
+    # every required skill (plus its aliases) maps to the normalized skill name
+    aliases = {normalize_skill(k): v for k, v in (aliases or {}).items()}
+    patterns = []
+    for details in catalog.values():
+        for s in details["required_skills"]:
+            label = normalize_skill(s)
+            patterns.append((s, label))
+            patterns.extend((alias, label) for alias in aliases.get(label, ()))
+    return KeywordAutomaton(patterns, whole_word=True)